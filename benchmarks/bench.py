@@ -0,0 +1,135 @@
+import argparse
+import importlib
+import json
+import math
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+PUZZLES_DIR = Path(__file__).resolve().parent.parent / "puzzles"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# Make the days importable the same way puzzles/answers.py imports them
+sys.path.insert(0, str(PUZZLES_DIR))
+
+
+def discover(days: Optional[List[int]] = None) -> List[Path]:
+    """
+    Find every checked-in input for every day, optionally limited to the given days
+    """
+    inputs = []
+    for day_dir in sorted(PUZZLES_DIR.glob("day[0-9][0-9]")):
+        day = int(day_dir.name[3:])
+        if day == 0 or (days and day not in days):
+            continue
+        inputs.extend(sorted(day_dir.glob("test_input*.txt")))
+        inputs.extend(sorted(day_dir.glob("input.txt")))
+    return inputs
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile, which is always one of the recorded samples
+    """
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def time_puzzle(filename: Path, warmup: int, repeat: int) -> Dict:
+    day_name = filename.parent.name
+    puzzle = importlib.import_module(f"{day_name}.{day_name}").puzzle
+    try:
+        for _ in range(warmup):
+            puzzle(str(filename))
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            puzzle(str(filename))
+            samples.append(time.perf_counter() - start)
+    except Exception as e:  # pylint: disable=broad-except
+        # Some example inputs only cover one part of a day, e.g. day20's has no 'rx'
+        return {"error": f"{type(e).__name__}: {e}"}
+
+    return {
+        "median": statistics.median(samples),
+        "p95": percentile(samples, 0.95),
+        "min": min(samples),
+        "samples": samples,
+    }
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Return the names of every benchmark whose median got slower than the baseline by more than
+    'threshold', a fraction e.g. 0.1 for 10%
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous or "median" not in previous or "median" not in result:
+            continue
+        if result["median"] > previous["median"] * (1.0 + threshold):
+            regressions.append(name)
+    return regressions
+
+
+def print_table(results: Dict, baseline: Dict, regressions: List[str]) -> None:
+    print(f"{'Benchmark':<28} {'Median (ms)':>12} {'p95 (ms)':>10} {'Baseline':>10} {'Change':>8}")
+    for name, result in results.items():
+        if "error" in result:
+            print(f"{name:<28} {result['error']}")
+            continue
+        line = f"{name:<28} {result['median'] * 1e3:>12.3f} {result['p95'] * 1e3:>10.3f}"
+        previous = baseline.get(name, {})
+        if "median" in previous:
+            change = result["median"] / previous["median"] - 1.0
+            line += f" {previous['median'] * 1e3:>10.3f} {change:>+8.1%}"
+        if name in regressions:
+            line += "  REGRESSION"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time every day's puzzle() on the checked-in inputs",
+    )
+    parser.add_argument(
+        "--day", type=int, action="append", help="only benchmark this day, repeatable",
+    )
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs before measuring")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per input")
+    parser.add_argument("--json", type=Path, help="write the results to this file as JSON")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="overwrite the baseline with these results",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.1,
+        help="fractional slow down of the median that counts as a regression (default: 0.1)",
+    )
+    args = parser.parse_args()
+
+    results = {
+        f"{filename.parent.name}/{filename.name}": time_puzzle(filename, args.warmup, args.repeat)
+        for filename in discover(args.day)
+    }
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+    regressions = compare(results, baseline, args.threshold)
+    print_table(results, baseline, regressions)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2))
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
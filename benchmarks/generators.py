@@ -0,0 +1,416 @@
+"""
+Seeded generators for puzzle inputs of any size, used to scale-test each day.
+
+Every generator takes a random.Random, a size and a text stream to write to. The meaning of size
+depends on the day, e.g. the number of lines for line based puzzles or the side length of grids.
+Inputs are written without a trailing newline, matching the checked-in input.txt files.
+"""
+import argparse
+import itertools
+import math
+import random
+import string
+import sys
+from typing import Callable, Dict, Iterable, List, TextIO, Tuple
+
+
+DIGIT_WORDS = ["zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+CAMEL_CARDS = "23456789TJQKA"
+SCHEMATIC_SYMBOLS = "*#+$/@%&=-"
+ALMANAC_CATEGORIES = [
+    "seed", "soil", "fertilizer", "water", "light", "temperature", "humidity", "location",
+]
+
+
+def write_lines(out: TextIO, lines: Iterable[str]) -> None:
+    for index, line in enumerate(lines):
+        if index:
+            out.write("\n")
+        out.write(line)
+
+
+def random_grid_row(rng: random.Random, width: int, table: bytes) -> bytearray:
+    """
+    A row where each character is picked from 'table', a 256 byte translation of random bytes.
+    This is far faster than rng.choices for the very large grids.
+    """
+    return bytearray(rng.randbytes(width).translate(table))
+
+
+def weighted_table(weights: Dict[str, int]) -> bytes:
+    """
+    Build a 256 byte translation table where each character appears in proportion to its weight
+    """
+    total = sum(weights.values())
+    table = bytearray()
+    for char, weight in weights.items():
+        table.extend(char.encode() * (256 * weight // total))
+    fill = next(iter(weights)).encode()
+    return bytes(table.ljust(256, fill))
+
+
+def unique_names(rng: random.Random, count: int, reserved: Iterable[str] = ()) -> List[str]:
+    """
+    Random distinct lowercase names, as short as possible for the number required
+    """
+    length = 2
+    while 26 ** length < 2 * count:
+        length += 1
+    names: set = set()
+    taken = set(reserved)
+    while len(names) < count:
+        name = "".join(rng.choices(string.ascii_lowercase, k=length))
+        if name not in taken:
+            names.add(name)
+    return sorted(names)
+
+
+def generate_day01(rng: random.Random, size: int, out: TextIO) -> None:
+    """
+    'size' calibration lines, each containing at least one digit or spelled out digit
+    """
+    filler = string.ascii_lowercase
+    tokens = list(string.digits) + DIGIT_WORDS
+
+    def line() -> str:
+        parts = rng.choices(filler, k=rng.randint(2, 40))
+        for _ in range(rng.randint(1, 4)):
+            parts.insert(rng.randrange(len(parts) + 1), rng.choice(tokens))
+        return "".join(parts)
+
+    write_lines(out, (line() for _ in range(size)))
+
+
+def generate_day02(rng: random.Random, size: int, out: TextIO) -> None:
+    """
+    'size' games of up to six reveals each
+    """
+    def reveal() -> str:
+        colors = rng.sample(["red", "green", "blue"], k=rng.randint(1, 3))
+        return ", ".join(f"{rng.randint(1, 20)} {color}" for color in colors)
+
+    write_lines(out, (
+        f"Game {game_id}: " + "; ".join(reveal() for _ in range(rng.randint(1, 6)))
+        for game_id in range(1, size + 1)
+    ))
+
+
+def generate_day03(rng: random.Random, size: int, out: TextIO) -> None:
+    """
+    A 'size' by 'size' engine schematic
+    """
+    def row() -> str:
+        cells: List[str] = []
+        while len(cells) < size:
+            roll = rng.random()
+            if roll < 0.08:
+                cells.extend(str(rng.randint(1, 999)))
+            elif roll < 0.12:
+                cells.append(rng.choice(SCHEMATIC_SYMBOLS))
+            cells.append(".")
+        return "".join(cells[:size])
+
+    write_lines(out, (row() for _ in range(size)))
+
+
+def generate_day04(rng: random.Random, size: int, out: TextIO) -> None:
+    """
+    'size' scratchcards with 10 winning numbers and 25 of our numbers
+    """
+    width = len(str(size))
+    write_lines(out, (
+        f"Card {card:>{width}}: "
+        + " ".join(f"{n:>2}" for n in rng.sample(range(1, 100), 10))
+        + " | "
+        + " ".join(f"{n:>2}" for n in rng.sample(range(1, 100), 25))
+        for card in range(1, size + 1)
+    ))
+
+
+def generate_day05(rng: random.Random, size: int, out: TextIO) -> None:
+    """
+    An almanac with 'size' mappings per map and one seed range for every ten mappings
+    """
+    universe = 2 ** 32
+    seeds = []
+    for _ in range(max(1, size // 10)):
+        start = rng.randrange(universe)
+        seeds.extend([start, rng.randint(1, max(1, (universe - start) // 20))])
+    out.write("seeds: " + " ".join(map(str, seeds)))
+
+    for source, destination in itertools.pairwise(ALMANAC_CATEGORIES):
+        # Shuffle consecutive blocks of the number line, leaving some unmapped
+        cuts = sorted(rng.sample(range(1, universe), size)) + [universe]
+        blocks = [(lower, upper - lower) for lower, upper in itertools.pairwise([0] + cuts)]
+        destinations = blocks[:]
+        rng.shuffle(destinations)
+        destination_starts = {}
+        position = 0
+        for lower, length in destinations:
+            destination_starts[lower] = position
+            position += length
+        mappings = [
+            f"{destination_starts[lower]} {lower} {length}"
+            for lower, length in blocks
+            if rng.random() < 0.9
+        ]
+        rng.shuffle(mappings)
+        out.write(f"\n\n{source}-to-{destination} map:\n")
+        write_lines(out, mappings)
+
+
+def generate_day06(rng: random.Random, size: int, out: TextIO) -> None:
+    """
+    'size' races, every one of which can be won
+    """
+    times = [rng.randint(7, 99) for _ in range(size)]
+    records = [rng.randrange(time // 2 * (time - time // 2)) for time in times]
+    out.write("Time:     " + " ".join(f"{t:>5}" for t in times) + "\n")
+    out.write("Distance: " + " ".join(f"{d:>5}" for d in records))
+
+
+def generate_day07(rng: random.Random, size: int, out: TextIO) -> None:
+    """
+    'size' Camel Cards hands and bids
+    """
+    write_lines(out, (
+        f"{''.join(rng.choices(CAMEL_CARDS, k=5))} {rng.randint(1, 1000)}"
+        for _ in range(size)
+    ))
+
+
+def generate_day08(rng: random.Random, size: int, out: TextIO) -> None:
+    """
+    A network of roughly 'size' nodes shared between six ghosts.
+
+    Like the real puzzle, each ghost's path from its 'A' node to its 'Z' node is a whole number of
+    passes through the instructions and the 'Z' node leads back to the start of the same path.
+    """
+    ghosts = 6
+    budget = max(2, size // ghosts)
+    instruction_count = max(1, min(budget // 2, rng.randint(200, 300)))
+    instructions = "".join(rng.choices("LR", k=instruction_count))
+    path_lengths = [
+        instruction_count * rng.randint(max(1, budget // instruction_count // 2),
+                                        max(1, budget // instruction_count))
+        for _ in range(ghosts)
+    ]
+
+    width = 3
+    while 36 ** (width - 1) * 34 < sum(path_lengths) + ghosts:
+        width += 1
+    middle_last_chars = string.digits + string.ascii_uppercase[1:-1]
+    middle_names = (
+        "".join(prefix) + last
+        for prefix in itertools.product(string.digits + string.ascii_uppercase, repeat=width - 1)
+        for last in middle_last_chars
+    )
+
+    paths = []
+    for ghost, length in enumerate(path_lengths):
+        prefix = "A" * (width - 1) if ghost == 0 else str(ghost).zfill(width - 1)
+        # The first ghost's path has to finish at ZZZ for part 1, the others can't end that way
+        end = "Z" * width if ghost == 0 else prefix + "Z"
+        paths.append([prefix + "A"] + [next(middle_names) for _ in range(length - 1)] + [end])
+    names = [name for path in paths for name in path]
+
+    rules: Dict[str, Tuple[str, str]] = {}
+    for path in paths:
+        for index, name in enumerate(path[:-1]):
+            # The side not chosen by the instruction can lead anywhere
+            successor, decoy = path[index + 1], rng.choice(names)
+            if instructions[index % instruction_count] == "L":
+                rules[name] = (successor, decoy)
+            else:
+                rules[name] = (decoy, successor)
+        rules[path[-1]] = rules[path[0]]
+
+    rng.shuffle(names)
+    out.write(instructions + "\n\n")
+    write_lines(out, (f"{name} = ({rules[name][0]}, {rules[name][1]})" for name in names))
+
+
+def generate_day09(rng: random.Random, size: int, out: TextIO) -> None:
+    """
+    'size' histories of 21 values, each a polynomial sequence
+    """
+    length = 21
+
+    def history() -> str:
+        degree = rng.randint(1, 10)
+        sequence = [rng.randint(-5, 5)] * (length - degree)
+        for _ in range(degree):
+            sequence = list(itertools.accumulate(sequence, initial=rng.randint(-20, 20)))
+        return " ".join(map(str, sequence))
+
+    write_lines(out, (history() for _ in range(size)))
+
+
+def _loop_bounds(rng: random.Random, size: int):
+    """
+    Random top and bottom rows for each column of an x-monotone loop. Neighbouring columns never
+    overlap, max(top[x-1], top[x]) < min(bottom[x-1], bottom[x]), so the loop never meets itself.
+    """
+    left = rng.randrange(max(1, size // 10))
+    right = size - 1 - rng.randrange(max(1, size // 10))
+    step = max(1, size // 50)
+    top = [rng.randrange(size // 2)]
+    bottom = [rng.randrange(size // 2 + 1, size)]
+    for _ in range(left + 1, right + 1):
+        new_top = min(max(top[-1] + rng.randint(-step, step), 0), size - 2)
+        new_bottom = min(max(bottom[-1] + rng.randint(-step, step), 1), size - 1)
+        if not new_top < min(new_bottom, bottom[-1]) or not top[-1] < new_bottom:
+            new_top, new_bottom = top[-1], bottom[-1]
+        top.append(new_top)
+        bottom.append(new_bottom)
+    # The right hand column joins the top and bottom with a straight vertical pipe
+    top[-1], bottom[-1] = top[-2], bottom[-2]
+    return left, top, bottom
+
+
+def _loop_cells(rng: random.Random, size: int) -> List[Tuple[int, int]]:
+    left, top, bottom = _loop_bounds(rng, size)
+
+    def vertical(x, from_y, to_y):
+        # Cells strictly after from_y up to and including to_y
+        direction = 1 if to_y > from_y else -1
+        return [(x, y) for y in range(from_y + direction, to_y + direction, direction)]
+
+    cells = [(left, top[0])]
+    for column in range(1, len(top)):
+        cells.append((left + column, top[column - 1]))
+        cells.extend(vertical(left + column, top[column - 1], top[column]))
+    cells.extend(vertical(left + len(top) - 1, top[-1], bottom[-1]))
+    for column in range(len(bottom) - 1, 0, -1):
+        cells.extend(vertical(left + column, bottom[column], bottom[column - 1]))
+        cells.append((left + column - 1, bottom[column - 1]))
+    # Back up the left hand column, stopping before the first cell
+    cells.extend(vertical(left, bottom[0], top[0])[:-1])
+    return cells
+
+
+LOOP_PIPES = {
+    frozenset([(0, -1), (0, 1)]): "|",
+    frozenset([(-1, 0), (1, 0)]): "-",
+    frozenset([(0, -1), (1, 0)]): "L",
+    frozenset([(0, -1), (-1, 0)]): "J",
+    frozenset([(0, 1), (-1, 0)]): "7",
+    frozenset([(0, 1), (1, 0)]): "F",
+}
+
+
+def generate_day10(rng: random.Random, size: int, out: TextIO) -> None:
+    """
+    A 'size' by 'size' grid with one pipe loop and junk pipes everywhere else
+    """
+    size = max(size, 3)
+    cells = _loop_cells(rng, size)
+    junk = weighted_table({".": 4, "|": 1, "-": 1, "L": 1, "J": 1, "7": 1, "F": 1})
+    grid = [random_grid_row(rng, size, junk) for _ in range(size)]
+    for index, (x, y) in enumerate(cells):
+        previous_x, previous_y = cells[index - 1]
+        next_x, next_y = cells[(index + 1) % len(cells)]
+        pipe = LOOP_PIPES[frozenset([(previous_x - x, previous_y - y), (next_x - x, next_y - y)])]
+        grid[y][x] = ord(pipe)
+
+    # The start's shape is inferred from its neighbours, so junk must not point into it.
+    # Loop pipes next to the start are fine, they only ever point at their own neighbours.
+    start_x, start_y = rng.choice(cells)
+    loop = set(cells)
+    for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+        x, y = start_x + dx, start_y + dy
+        if 0 <= x < size and 0 <= y < size and (x, y) not in loop:
+            grid[y][x] = ord(".")
+    grid[start_y][start_x] = ord("S")
+
+    write_lines(out, (row.decode() for row in grid))
+
+
+def generate_day14(rng: random.Random, size: int, out: TextIO) -> None:
+    """
+    A 'size' by 'size' dish of round and cube rocks
+    """
+    table = weighted_table({".": 12, "O": 5, "#": 3})
+    write_lines(out, (random_grid_row(rng, size, table).decode() for _ in range(size)))
+
+
+def _primes(lower: int, upper: int) -> List[int]:
+    return [n for n in range(lower, upper) if all(n % d for d in range(2, math.isqrt(n) + 1))]
+
+
+def generate_day20(rng: random.Random, size: int, out: TextIO) -> None:
+    """
+    A circuit with 'size' flip-flop counters feeding rx through conjunctions, like the real puzzle.
+
+    Each counter is a chain of flip-flops counting button presses in binary. A conjunction resets
+    the chain once it reaches a prime period, so part 2 is the lowest common multiple of the primes.
+    """
+    bits = 12
+    while len(_primes(2 ** (bits - 1) + 1, 2 ** bits)) < size:
+        bits += 1
+    periods = rng.sample(_primes(2 ** (bits - 1) + 1, 2 ** bits), size)
+    names = unique_names(rng, size * (bits + 2) + 1, reserved=["rx", "roadcaster"])
+    rng.shuffle(names)
+    final = names.pop()
+
+    lines = []
+    first_flip_flops = []
+    for period in periods:
+        flip_flops = [names.pop() for _ in range(bits)]
+        counter, inverter = names.pop(), names.pop()
+        first_flip_flops.append(flip_flops[0])
+        resets = [flip_flops[0]]
+        for bit, name in enumerate(flip_flops):
+            outputs = flip_flops[bit + 1:bit + 2]
+            if period >> bit & 1:
+                outputs.append(counter)
+            elif bit:
+                resets.append(name)
+            lines.append(f"%{name} -> {', '.join(outputs)}")
+        lines.append(f"&{counter} -> {', '.join(resets + [inverter])}")
+        lines.append(f"&{inverter} -> {final}")
+    lines.append(f"&{final} -> rx")
+    lines.insert(0, f"broadcaster -> {', '.join(first_flip_flops)}")
+    rng.shuffle(lines)
+    write_lines(out, lines)
+
+
+GENERATORS: Dict[int, Callable[[random.Random, int, TextIO], None]] = {
+    1: generate_day01,
+    2: generate_day02,
+    3: generate_day03,
+    4: generate_day04,
+    5: generate_day05,
+    6: generate_day06,
+    7: generate_day07,
+    8: generate_day08,
+    9: generate_day09,
+    10: generate_day10,
+    14: generate_day14,
+    20: generate_day20,
+}
+
+
+def generate(day: int, size: int, out: TextIO, seed: int = 0) -> None:
+    GENERATORS[day](random.Random(seed), size, out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a generated puzzle input")
+    parser.add_argument("day", type=int, choices=sorted(GENERATORS))
+    parser.add_argument(
+        "size", type=int, help="lines, records or grid side length depending on the day",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="file to write to (default: stdout)")
+    args = parser.parse_args()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            generate(args.day, args.size, f, args.seed)
+    else:
+        generate(args.day, args.size, sys.stdout, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,94 @@
+import argparse
 import importlib
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, List, Tuple
 from unittest.mock import ANY
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+# pylint: disable-next=wrong-import-position
+from puzzles.common import cache, instrument, memory  # noqa: E402
 
-def test(day, filename, answer):
+
+# (day, filename, expected answer)
+JOBS: List[Tuple[int, str, Tuple[Any, Any]]] = [
+    # Day 01
+    (1, "test_input1.txt", (142, 142)),
+    (1, "test_input2.txt", (ANY, 281)),
+    (1, "input.txt", (57346, 57345)),
+    # Day 02
+    (2, "test_input1.txt", (8, 2286)),
+    (2, "input.txt", (2237, 66681)),
+    # Day 03
+    (3, "test_input.txt", (4361, 467835)),
+    (3, "input.txt", (531561, 83279367)),
+    # Day 04
+    (4, "test_input.txt", (13, 30)),
+    (4, "input.txt", (23441, 5923918)),
+    # Day 05
+    (5, "test_input.txt", (35, 46)),
+    (5, "input.txt", (388071289, 84206669)),
+    # Day 06
+    (6, "test_input.txt", (288, 71503)),
+    (6, "input.txt", (219849, 29432455)),
+    # Day 07
+    (7, "test_input.txt", (6440, 5905)),
+    (7, "input.txt", (247815719, 248747492)),
+    # Day 08
+    (8, "test_input.txt", (2, ANY)),
+    (8, "test_input2.txt", (6, ANY)),
+    (8, "test_input3.txt", (ANY, 6)),
+    (8, "input.txt", (17287, 18625484023687)),
+    # Day 09
+    (9, "test_input.txt", (114, 2)),
+    (9, "input.txt", (1882395907, 1005)),
+    # Day 10
+    (10, "test_input.txt", (8, 1)),
+    (10, "input.txt", (6931, 357)),
+    # Day 14
+    (14, "test_input.txt", (136, 64)),
+    (14, "input.txt", (105208, 102943)),
+    # Day 20
+    # (20, "test_input.txt", (32000000, ANY)),
+    (20, "input.txt", (818723272, 243902373381257)),
+]
+
+# Peak traced memory allowed for any one job with --mem
+DEFAULT_MEMORY_BUDGET_MIB = 256
+
+
+def solve(day, filename, profile=False, use_cache=False, trace_memory=False):
+    """
+    Import and run a single day, returning its result, how long the puzzle took,
+    the instrumentation collected while it ran when profiling and its memory use when tracing.
+    This runs inside the worker processes so it must only take and return picklable values.
+    """
     padded_day = str(day).zfill(2)
     puzzle = importlib.import_module(f"day{padded_day}.day{padded_day}").puzzle
     full_filename = f"puzzles/day{padded_day}/{filename}"
 
-    full_result = puzzle(full_filename)
+    if profile:
+        instrument.reset()
+        instrument.enable()
+    memory_report = None
+    start = time.perf_counter()
+    if use_cache:
+        full_result = cache.solve(puzzle, full_filename)
+    elif trace_memory:
+        with memory.traced() as memory_report:
+            full_result = puzzle(full_filename)
+    else:
+        full_result = puzzle(full_filename)
+    elapsed = time.perf_counter() - start
+    instrument.disable()
+    return full_result, elapsed, instrument.report(), memory_report
+
+
+def check(day, filename, answer, full_result):
+    padded_day = str(day).zfill(2)
     for part, part_answer, result in zip([1, 2], answer, full_result):
         if part_answer == result:
             verdict = "PASS"
@@ -18,46 +98,113 @@ def test(day, filename, answer):
     return full_result == answer
 
 
-if __name__ == "__main__":
-    all_correct = all((
-        # Day 01
-        test(1, "test_input1.txt", (142, 142)),
-        test(1, "test_input2.txt", (ANY, 281)),
-        test(1, "input.txt", (57346, 57345)),
-        # Day 02
-        test(2, "test_input1.txt", (8, 2286)),
-        test(2, "input.txt", (2237, 66681)),
-        # Day 03
-        test(3, "test_input.txt", (4361, 467835)),
-        test(3, "input.txt", (531561, 83279367)),
-        # Day 04
-        test(4, "test_input.txt", (13, 30)),
-        test(4, "input.txt", (23441, 5923918)),
-        # Day 05
-        test(5, "test_input.txt", (35, 46)),
-        test(5, "input.txt", (388071289, 84206669)),
-        # Day 06
-        test(6, "test_input.txt", (288, 71503)),
-        test(6, "input.txt", (219849, 29432455)),
-        # Day 07
-        test(7, "test_input.txt", (6440, 5905)),
-        test(7, "input.txt", (247815719, 248747492)),
-        # Day 08
-        test(8, "test_input.txt", (2, ANY)),
-        test(8, "test_input2.txt", (6, ANY)),
-        test(8, "test_input3.txt", (ANY, 6)),
-        test(8, "input.txt", (17287, 18625484023687)),
-        # Day 09
-        test(9, "test_input.txt", (114, 2)),
-        test(9, "input.txt", (1882395907, 1005)),
-        # Day 10
-        test(10, "test_input.txt", (8, 1)),
-        test(10, "input.txt", (6931, 357)),
-        # Day 14
-        test(14, "test_input.txt", (136, 64)),
-        test(14, "input.txt", (105208, 102943)),
-        # Day 20
-        # test(20, "test_input.txt", (32000000, ANY)),
-        test(20, "input.txt", (818723272, 243902373381257)),
-    ))
+def run_jobs(jobs, workers, profile=False, use_cache=False, trace_memory=False):
+    """
+    Solve every job, in parallel when more than one worker is requested.
+    Results are returned in the same order as the jobs.
+    """
+    if workers <= 1:
+        return [
+            solve(day, filename, profile, use_cache, trace_memory) for day, filename, _ in jobs
+        ]
+
+    # Start the biggest inputs first so the slowest job isn't left waiting for a free worker
+    def input_size(index):
+        day, filename, _ = jobs[index]
+        return os.path.getsize(f"puzzles/day{day:02d}/{filename}")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            index: executor.submit(
+                solve, jobs[index][0], jobs[index][1], profile, use_cache, trace_memory,
+            )
+            for index in sorted(range(len(jobs)), key=input_size, reverse=True)
+        }
+        return [futures[index].result() for index in range(len(jobs))]
+
+
+def print_timings(jobs, results, wall_time):
+    print()
+    print(f"{'Day':>3}  {'Input':<16} {'Time (s)':>9}")
+    for (day, filename, _), (_, elapsed, _, _) in zip(jobs, results):
+        print(f"{day:>3}  {filename:<16} {elapsed:>9.3f}")
+
+    # Each job is independent so the critical path is simply the slowest job
+    total = sum(elapsed for _, elapsed, _, _ in results)
+    (day, filename, _), (_, slowest, _, _) = max(zip(jobs, results), key=lambda pair: pair[1][1])
+    print(f"Critical path: day {day:02d} {filename} {slowest:.3f}s")
+    print(f"Sum of jobs: {total:.3f}s, wall time: {wall_time:.3f}s")
+
+
+def check_memory(jobs, results, budget_mib):
+    """
+    Print each job's peak memory and biggest allocation sites, returning whether all were in budget
+    """
+    reports = []
+    within_budget = True
+    for (day, filename, _), (_, _, _, memory_report) in zip(jobs, results):
+        reports.append({"label": f"day {day:02d} {filename}", **memory_report})
+        if memory_report["peak"] > budget_mib * memory.MIB:
+            within_budget = False
+            print(f"Day {day:02d} {filename}: peak memory over the {budget_mib:g} MiB budget")
+    print()
+    print(memory.format_table(reports))
+    return within_budget
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-j", "--workers", type=int, default=1,
+        help=f"number of worker processes, e.g. {os.cpu_count()} (default: 1, run in-process)",
+    )
+    parser.add_argument("--timings", action="store_true", help="print the time taken by each job")
+    parser.add_argument(
+        "--profile", choices=["table", "json"],
+        help="collect each day's phase timers and counters and print them in this format",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="recompute every answer instead of reusing cached results",
+    )
+    parser.add_argument(
+        "--mem", action="store_true",
+        help="trace each day's peak memory and biggest allocation sites, failing if over budget",
+    )
+    parser.add_argument(
+        "--mem-budget", type=float, default=DEFAULT_MEMORY_BUDGET_MIB, metavar="MIB",
+        help=f"peak memory allowed for each job with --mem (default: {DEFAULT_MEMORY_BUDGET_MIB})",
+    )
+    args = parser.parse_args()
+    # Timing, profiling and memory tracing need the puzzles to actually run
+    use_cache = (
+        cache.enabled() and not args.no_cache
+        and not args.timings and not args.profile and not args.mem
+    )
+
+    start = time.perf_counter()
+    results = run_jobs(
+        JOBS, args.workers, profile=bool(args.profile), use_cache=use_cache, trace_memory=args.mem,
+    )
+    wall_time = time.perf_counter() - start
+
+    all_correct = all([
+        check(day, filename, answer, full_result)
+        for (day, filename, answer), (full_result, _, _, _) in zip(JOBS, results)
+    ])
+    if args.timings:
+        print_timings(JOBS, results, wall_time)
+    if args.profile:
+        collected = instrument.merge([report for _, _, report, _ in results])
+        print()
+        if args.profile == "json":
+            print(instrument.format_json(collected))
+        else:
+            print(instrument.format_table(collected))
+    if args.mem:
+        all_correct = check_memory(JOBS, results, args.mem_budget) and all_correct
     sys.exit(0 if all_correct else 1)
+
+
+if __name__ == "__main__":
+    main()
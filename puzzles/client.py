@@ -0,0 +1,45 @@
+"""
+Thin client for puzzles/daemon.py. It only imports what it needs to talk to the socket so that
+each call costs little more than the solve itself.
+
+Example usage
+    $ python3.11 puzzles/client.py 7 puzzles/day07/test_input.txt
+    (6440, 5905)
+"""
+import json
+import os
+import socket
+import sys
+import tempfile
+
+
+DEFAULT_SOCKET = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR", tempfile.gettempdir()), f"aoc2023-{os.getuid()}.sock",
+)
+
+
+def solve(day, filename, socket_path=DEFAULT_SOCKET):
+    """
+    Ask the daemon for (part 1 answer, part 2 answer)
+    """
+    request = {"day": day, "filename": os.path.abspath(filename)}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(socket_path)
+        connection.sendall(json.dumps(request).encode() + b"\n")
+        with connection.makefile("rb") as f:
+            response = json.loads(f.readline())
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    return tuple(response["result"])
+
+
+def main():
+    if len(sys.argv) not in (3, 4):
+        print("Usage: client.py DAY FILENAME [SOCKET]\nPrints '(part 1 answer, part 2 answer)'")
+        sys.exit(1)
+    socket_path = sys.argv[3] if len(sys.argv) == 4 else DEFAULT_SOCKET
+    print(solve(int(sys.argv[1]), sys.argv[2], socket_path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Solve many inputs for one day in a single process, so each input costs only its solve time.
+
+Every day's script takes either a single filename or --batch with a directory of inputs or a
+manifest listing one input path per line. Batch inputs are usually one-offs, so they skip the
+answer cache rather than hashing every input and pushing useful entries out of it.
+Batch results are streamed as JSON lines in input order:
+    {"filename": "inputs/1.txt", "result": [6440, 5905]}
+    {"filename": "inputs/2.txt", "error": "ValueError: ..."}
+
+Example usage
+    $ python3.11 puzzles/day07/day07.py --batch inputs/ --workers 4
+"""
+import argparse
+import functools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, List, Tuple
+
+from puzzles.common import cache
+
+
+def input_files(source: str) -> List[str]:
+    """
+    Every file in the directory 'source', or every path listed in the manifest file 'source'.
+    Manifest paths are relative to the manifest, blank lines and lines starting with # are skipped
+    """
+    path = Path(source)
+    if path.is_dir():
+        return sorted(str(child) for child in path.iterdir() if child.is_file())
+
+    with open(path, encoding="utf-8") as f:
+        entries = [line.strip() for line in f]
+    return [
+        str(path.parent / entry)
+        for entry in entries
+        if entry and not entry.startswith("#")
+    ]
+
+
+def solve_one(puzzle: Callable, filename: str) -> Dict[str, Any]:
+    try:
+        return {"filename": filename, "result": list(puzzle(filename))}
+    except Exception as e:  # pylint: disable=broad-except
+        # One bad input shouldn't stop the rest of the batch
+        return {"filename": filename, "error": f"{type(e).__name__}: {e}"}
+
+
+def solve_all(puzzle: Callable, filenames: List[str], workers: int = 1) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the result of each file in order, as soon as it and every file before it are solved
+    """
+    solve = functools.partial(solve_one, puzzle)
+    if workers <= 1:
+        yield from map(solve, filenames)
+        return
+
+    # Hand out several inputs at a time so small inputs aren't dominated by pickling overhead
+    chunksize = max(1, len(filenames) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(solve, filenames, chunksize=chunksize)
+
+
+def run(puzzle: Callable, source: str, workers: int = 1, out: IO[str] = sys.stdout) -> bool:
+    """
+    Solve every input in 'source', writing a JSON line per input. Returns whether all succeeded
+    """
+    all_solved = True
+    for response in solve_all(puzzle, input_files(source), workers):
+        all_solved = all_solved and "error" not in response
+        out.write(json.dumps(response) + "\n")
+        out.flush()
+    return all_solved
+
+
+def as_tuple(result: Tuple[Any, ...]) -> str:
+    return str(result)
+
+
+def comma_separated(result: Tuple[Any, ...]) -> str:
+    return f"{result[0]}, {result[1]}"
+
+
+def main(puzzle: Callable, format_result: Callable[[Tuple[Any, ...]], str] = as_tuple) -> None:
+    """
+    Command line entry point shared by the days
+    """
+    parser = argparse.ArgumentParser(
+        epilog="Prints '(part 1 answer, part 2 answer)', or a JSON line per input with --batch",
+    )
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("filename", nargs="?")
+    group.add_argument(
+        "--batch", metavar="DIR_OR_MANIFEST",
+        help="solve every input in a directory, or listed in a manifest file",
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, default=1,
+        help=f"worker processes for --batch, e.g. {os.cpu_count()} (default: 1, run in-process)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="recompute the answer instead of reusing a cached result (--batch never caches)",
+    )
+    args = parser.parse_args()
+
+    if args.batch:
+        sys.exit(0 if run(puzzle, args.batch, args.workers) else 1)
+    if args.no_cache:
+        print(format_result(puzzle(args.filename)))
+    else:
+        print(format_result(cache.solve(puzzle, args.filename)))
@@ -0,0 +1,161 @@
+"""
+On-disk cache of puzzle answers, keyed on the contents of the input, of the day's source file and
+of the shared code in puzzles/common that every day runs through, and on the Python and numpy
+versions, since several days switch to a different engine when numpy is installed.
+
+Editing the input, the solution or the shared code changes the key, so stale answers are never
+returned.
+Entries are small JSON files; the least recently used are deleted once the cache directory grows
+beyond its size limit. Set AOC2023_NO_CACHE=1 to always recompute.
+Streams and stdin can only be read once so they are never cached.
+"""
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sys
+import tempfile
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple
+
+from puzzles.common import puzzle_input
+
+
+DEFAULT_DIRECTORY = Path(
+    os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+) / "aoc2023"
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+SHARED_DIRECTORY = Path(__file__).resolve().parent
+
+
+def enabled() -> bool:
+    return not os.environ.get("AOC2023_NO_CACHE")
+
+
+def hash_file(filename: str) -> str:
+    with open(filename, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def hash_source(source_file: str) -> str:
+    # Source files don't change while running, so only hash each once per process
+    return hash_file(source_file)
+
+
+@functools.lru_cache(maxsize=None)
+def hash_shared_sources() -> str:
+    """
+    A single hash of every module in puzzles/common, which all the days parse their input with
+    """
+    digest = hashlib.sha256()
+    for path in sorted(SHARED_DIRECTORY.glob("*.py")):
+        digest.update(f"{path.name}:{hash_source(str(path))}\n".encode())
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def environment() -> str:
+    # The installed version is enough, there's no need to import numpy
+    try:
+        numpy_version = f"numpy-{metadata.version('numpy')}"
+    except metadata.PackageNotFoundError:
+        numpy_version = "no-numpy"
+    return f"{sys.version}:{numpy_version}"
+
+
+class ResultCache:
+    def __init__(self, directory: Path = DEFAULT_DIRECTORY, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        # Running size of the entries, so a put only scans the directory when the cache may be full.
+        # Other processes can add entries too, so this is only a hint and evict() recounts
+        self.total_bytes: Optional[int] = None
+
+    def key(self, puzzle: Callable, filename: str) -> str:
+        source_file = inspect.getsourcefile(puzzle)
+        assert source_file, f"Can't find the source of {puzzle}"
+        combined = ":".join((
+            environment(), hash_shared_sources(), hash_source(source_file), hash_file(filename),
+        ))
+        return hashlib.sha256(combined.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[Any, ...]]:
+        path = self.directory / f"{key}.json"
+        try:
+            with open(path, encoding="utf-8") as f:
+                result = json.load(f)["result"]
+            # Bump the modification time so eviction sees this as recently used
+            os.utime(path)
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return None
+        return tuple(result)
+
+    def put(self, key: str, result: Tuple[Any, ...]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Write then rename so that parallel runs never read a half written entry
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.directory, suffix=".tmp", delete=False, encoding="utf-8",
+        ) as f:
+            json.dump({"result": list(result)}, f)
+        size = os.path.getsize(f.name)
+        os.replace(f.name, self.directory / f"{key}.json")
+
+        if self.total_bytes is None:
+            self.total_bytes = sum(size for _, size, _ in self.entries())
+        else:
+            self.total_bytes += size
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def entries(self) -> List[Tuple[float, int, Path]]:
+        """
+        (last used time, size, path) of every entry, oldest first
+        """
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # Evicted by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def evict(self) -> None:
+        """
+        Delete the least recently used entries until the cache fits in max_bytes
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        self.total_bytes = total
+
+    def solve(self, puzzle: Callable, filename: str) -> Tuple[Any, ...]:
+        key = self.key(puzzle, filename)
+        result = self.get(key)
+        if result is None:
+            result = tuple(puzzle(filename))
+            self.put(key, result)
+        return result
+
+
+@functools.lru_cache(maxsize=None)
+def default_cache() -> ResultCache:
+    # Shared so that its running size survives across the inputs of a batch
+    return ResultCache()
+
+
+def solve(puzzle: Callable, filename: str) -> Tuple[Any, ...]:
+    """
+    Return puzzle(filename), from the default cache when possible
+    """
+    if not enabled() or not puzzle_input.is_path(filename):
+        return puzzle(filename)
+    return default_cache().solve(puzzle, filename)
@@ -0,0 +1,116 @@
+"""
+Named timers and counters for measuring the phases inside each puzzle.
+
+Days leave their instrumentation in place permanently, so everything here is close to free until
+enable() is called: timer() hands back a shared do-nothing context manager and count() returns
+after a single flag check.
+
+Example:
+    with instrument.timer("day05.parse"):
+        almanac = Almanac.from_content(content)
+    instrument.count("day14.tilt_steps", steps)
+"""
+import json
+import time
+from contextlib import nullcontext
+from typing import Any, ContextManager, Dict, List
+
+
+_enabled = False  # pylint: disable=invalid-name
+# name -> [total seconds, calls]
+_timers: Dict[str, List[float]] = {}
+_counters: Dict[str, int] = {}
+_NULL_TIMER = nullcontext()
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_exc_info: Any) -> None:
+        elapsed = time.perf_counter() - self.start
+        totals = _timers.setdefault(self.name, [0.0, 0])
+        totals[0] += elapsed
+        totals[1] += 1
+
+
+def enable() -> None:
+    global _enabled  # pylint: disable=global-statement
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled  # pylint: disable=global-statement
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    _timers.clear()
+    _counters.clear()
+
+
+def timer(name: str) -> ContextManager:
+    """
+    Time the body of a with statement, accumulating the total under 'name'
+    """
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(name)
+
+
+def count(name: str, amount: int = 1) -> None:
+    if _enabled:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def report() -> Dict[str, Dict[str, Any]]:
+    """
+    A JSON serialisable copy of everything collected since the last reset
+    """
+    return {
+        "timers": {
+            name: {"seconds": seconds, "calls": calls}
+            for name, (seconds, calls) in _timers.items()
+        },
+        "counters": dict(_counters),
+    }
+
+
+def merge(reports: List[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Combine reports, e.g. from several worker processes, into one
+    """
+    merged: Dict[str, Dict[str, Any]] = {"timers": {}, "counters": {}}
+    for single in reports:
+        for name, timing in single["timers"].items():
+            totals = merged["timers"].setdefault(name, {"seconds": 0.0, "calls": 0})
+            totals["seconds"] += timing["seconds"]
+            totals["calls"] += timing["calls"]
+        for name, value in single["counters"].items():
+            merged["counters"][name] = merged["counters"].get(name, 0) + value
+    return merged
+
+
+def format_table(collected: Dict[str, Dict[str, Any]]) -> str:
+    lines = [f"{'Timer':<40} {'Calls':>8} {'Total (ms)':>12}"]
+    for name, timing in sorted(collected["timers"].items()):
+        lines.append(f"{name:<40} {timing['calls']:>8} {timing['seconds'] * 1e3:>12.3f}")
+    lines.append(f"{'Counter':<40} {'Value':>21}")
+    for name, value in sorted(collected["counters"].items()):
+        lines.append(f"{name:<40} {value:>21}")
+    return "\n".join(lines)
+
+
+def format_json(collected: Dict[str, Dict[str, Any]]) -> str:
+    return json.dumps(collected, indent=2, sort_keys=True)
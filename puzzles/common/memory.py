@@ -0,0 +1,95 @@
+"""
+Peak memory and the largest allocation sites of a solve, measured with tracemalloc.
+
+tracemalloc only knows the exact peak, not what was allocated at that moment, so a background
+thread samples the traced memory and snapshots whenever it reaches a new high. The top sites
+reported are from the snapshot closest to the peak.
+Tracing slows allocation heavy days down several times, so only switch it on when asked to.
+
+Example:
+    with memory.traced() as report:
+        puzzle(filename)
+    print(report["peak"], report["top"])
+"""
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+MIB = 1024 * 1024
+SAMPLE_INTERVAL = 0.005
+
+
+class _Sampler(threading.Thread):
+    def __init__(self, interval: float):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.highest = 0
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def sample(self) -> None:
+        current, _ = tracemalloc.get_traced_memory()
+        if current > self.highest:
+            self.highest = current
+            self.snapshot = tracemalloc.take_snapshot()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+
+def short_path(filename: str) -> str:
+    # The file and its directory, e.g. day08/day08.py, is enough to find a site
+    return str(Path(*Path(filename).parts[-2:]))
+
+
+def top_sites(snapshot: Optional[tracemalloc.Snapshot], limit: int) -> List[Dict[str, Any]]:
+    if snapshot is None:
+        return []
+    # Leave out the sampler's own allocations
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, module_file)
+        for module_file in (__file__, threading.__file__, tracemalloc.__file__)
+    ])
+    return [
+        {"site": f"{short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+         "bytes": stat.size}
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+
+@contextmanager
+def traced(top: int = 5, interval: float = SAMPLE_INTERVAL) -> Iterator[Dict[str, Any]]:
+    """
+    Trace allocations in the body of a with statement. The yielded dict is filled in on exit with
+    the peak bytes allocated and the 'top' largest allocation sites near that peak
+    """
+    report: Dict[str, Any] = {}
+    tracemalloc.start()
+    sampler = _Sampler(interval)
+    sampler.start()
+    try:
+        yield report
+    finally:
+        sampler.stopped.set()
+        sampler.join()
+        # Catch a peak that was still live when the body finished
+        sampler.sample()
+        _, peak = tracemalloc.get_traced_memory()
+        report["peak"] = peak
+        report["top"] = top_sites(sampler.snapshot, top)
+        tracemalloc.stop()
+
+
+def format_table(reports: List[Dict[str, Any]]) -> str:
+    """
+    'reports' are traced() results, each with an added "label"
+    """
+    lines = [f"{'Job':<28} {'Peak (MiB)':>11}"]
+    for report in reports:
+        lines.append(f"{report['label']:<28} {report['peak'] / MIB:>11.2f}")
+        for site in report["top"]:
+            lines.append(f"    {site['site']:<60} {site['bytes'] / MIB:>8.2f}")
+    return "\n".join(lines)
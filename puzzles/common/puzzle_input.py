@@ -0,0 +1,109 @@
+"""
+Memory-mapped access to puzzle inputs.
+
+Files are mapped rather than read so that large inputs are never copied into memory or decoded
+into one big str. The iterators hand out memoryview slices of the mapping without copying; a slice
+is only valid while its file is mapped, so convert it (bytes(), str(line, "ascii"), int()) before
+keeping hold of it.
+
+Line oriented days can also be given an open stream, or "-" for stdin, which is read one line at
+a time so that piped input is never held in memory all at once.
+
+Example:
+    for line in puzzle_input.lines(filename):
+        game = Game.from_string(str(line, "ascii"))
+"""
+import mmap
+import os
+import sys
+from contextlib import contextmanager
+from typing import IO, Iterator, Union
+
+Buffer = Union[bytes, mmap.mmap]
+Source = Union[str, "os.PathLike[str]", IO]
+STDIN = "-"
+
+
+@contextmanager
+def mapped(filename: str) -> Iterator[Buffer]:
+    """
+    Map the whole of 'filename' read-only
+    """
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Empty files can't be mapped
+            yield b""
+            return
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield data
+        finally:
+            try:
+                data.close()
+            except BufferError:
+                # A slice outlived the with block, the mapping is released once it's collected
+                pass
+
+
+def iter_lines(data: Buffer) -> Iterator[memoryview]:
+    """
+    Each line of 'data' without its line ending
+    """
+    view = memoryview(data)
+    start = 0
+    size = len(data)
+    while start < size:
+        end = data.find(b"\n", start)
+        if end == -1:
+            end = size
+        line_end = end
+        if line_end > start and data[line_end - 1] == ord("\r"):
+            line_end -= 1
+        yield view[start:line_end]
+        start = end + 1
+
+
+def iter_blocks(data: Buffer) -> Iterator[memoryview]:
+    """
+    Each chunk of 'data' separated by a blank line
+    """
+    view = memoryview(data)
+    start = 0
+    size = len(data)
+    while start < size:
+        end = data.find(b"\n\n", start)
+        if end == -1:
+            end = size
+        yield view[start:end]
+        start = end + 2
+
+
+def is_path(source: Source) -> bool:
+    """
+    Whether 'source' names a file on disk rather than a stream
+    """
+    return isinstance(source, (str, os.PathLike)) and source != STDIN
+
+
+def iter_stream_lines(stream: IO) -> Iterator[bytes]:
+    """
+    Each line of a binary or text stream without its line ending, reading one line at a time
+    """
+    for line in stream:
+        if isinstance(line, str):
+            line = line.encode()
+        yield line.rstrip(b"\r\n")
+
+
+def lines(source: Source) -> Iterator[Union[memoryview, bytes]]:
+    """
+    Iterate over the lines of 'source'; a filename is mapped, "-" reads stdin and anything else is
+    treated as an open stream
+    """
+    if source == STDIN:
+        yield from iter_stream_lines(sys.stdin.buffer)
+    elif isinstance(source, (str, os.PathLike)):
+        with mapped(os.fspath(source)) as data:
+            yield from iter_lines(data)
+    else:
+        yield from iter_stream_lines(source)
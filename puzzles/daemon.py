@@ -0,0 +1,90 @@
+"""
+A long lived process with every day already imported, answering solve requests over a Unix socket.
+
+Each request and response is a single line of JSON:
+    {"day": 7, "filename": "/abs/path/input.txt"}
+    {"result": [6440, 5905]} or {"error": "..."}
+
+Use puzzles/client.py to send requests.
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import signal
+import sys
+from pathlib import Path
+from typing import Callable, Dict
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+# pylint: disable-next=wrong-import-position
+from puzzles.client import DEFAULT_SOCKET  # noqa: E402
+
+
+def load_puzzles() -> Dict[int, Callable]:
+    puzzles = {}
+    for day_dir in sorted(Path(__file__).resolve().parent.glob("day[0-9][0-9]")):
+        day = int(day_dir.name[3:])
+        if day == 0:
+            continue
+        module = importlib.import_module(f"puzzles.{day_dir.name}.{day_dir.name}")
+        puzzles[day] = module.puzzle
+    return puzzles
+
+
+def handle_request(puzzles: Dict[int, Callable], line: bytes) -> Dict:
+    try:
+        request = json.loads(line)
+        puzzle = puzzles[int(request["day"])]
+        return {"result": list(puzzle(request["filename"]))}
+    except Exception as e:  # pylint: disable=broad-except
+        # Report any failure to the client rather than taking down the daemon
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+async def start(socket_path: str, puzzles: Dict[int, Callable]) -> asyncio.AbstractServer:
+    async def on_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # A client may send any number of requests down the same connection
+        while line := await reader.readline():
+            # Puzzles are CPU bound so they run inline, one at a time
+            response = handle_request(puzzles, line)
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+        writer.close()
+        await writer.wait_closed()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    return await asyncio.start_unix_server(on_connection, path=socket_path)
+
+
+async def serve(socket_path: str, puzzles: Dict[int, Callable]) -> None:
+    server = await start(socket_path, puzzles)
+    # Closing the server stops serve_forever, letting the socket file be cleaned up
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, server.close)
+    async with server:
+        try:
+            await server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve puzzle solutions over a Unix socket")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    args = parser.parse_args()
+
+    puzzles = load_puzzles()
+    print(f"Loaded days {', '.join(map(str, puzzles))}, listening on {args.socket}")
+    try:
+        asyncio.run(serve(args.socket, puzzles))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
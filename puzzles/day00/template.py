@@ -1,16 +1,21 @@
-import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+# pylint: disable-next=wrong-import-position
+from puzzles.common import batch, instrument  # noqa: E402
 
 
 def puzzle(filename):
-    return (1, 2)
+    with instrument.timer("day00.part1"):
+        part1 = 1
+    with instrument.timer("day00.part2"):
+        part2 = 2
+    return (part1, part2)
 
 
 def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("filename")
-    args = parser.parse_args()
-    result = puzzle(args.filename)
-    print(f"{result[0]}, {result[1]}")
+    batch.main(puzzle, batch.comma_separated)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,16 @@
-import argparse
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+# pylint: disable-next=wrong-import-position
+from puzzles.common import batch, instrument, puzzle_input  # noqa: E402
 
 
 WORD_REPLACEMENTS = {
@@ -15,34 +27,152 @@ WORD_REPLACEMENTS = {
 }
 
 
+DIGITS = {str(digit): digit for digit in range(10)}
+
+
+# (transitions[state][byte] -> next state, outputs[state] -> value of a pattern ending here)
+Automaton = Tuple[List[List[int]], List[Optional[int]]]
+
+
+def build_automaton(patterns: Dict[str, int]) -> Automaton:
+    # Build the trie of the patterns
+    transitions = [[0] * 256]
+    outputs: List[Optional[int]] = [None]
+    for pattern, value in patterns.items():
+        state = 0
+        for byte in pattern.encode("ascii"):
+            if not transitions[state][byte]:
+                transitions[state][byte] = len(transitions)
+                transitions.append([0] * 256)
+                outputs.append(None)
+            state = transitions[state][byte]
+        outputs[state] = value
+
+    # Breadth first, point every missing edge at where the failure link would lead, turning the
+    # trie into a DFA so each byte costs a single lookup
+    failures = [0] * len(transitions)
+    queue = deque(state for state in transitions[0] if state)
+    while queue:
+        state = queue.popleft()
+        if outputs[state] is None:
+            outputs[state] = outputs[failures[state]]
+        for byte, next_state in enumerate(transitions[state]):
+            if next_state:
+                failures[next_state] = transitions[failures[state]][byte]
+                queue.append(next_state)
+            else:
+                transitions[state][byte] = transitions[failures[state]][byte]
+    return transitions, outputs
+
+
+def scan(automaton: Automaton, line: Iterable[int]) -> Optional[int]:
+    transitions, outputs = automaton
+    state = 0
+    for byte in line:
+        state = transitions[state][byte]
+        if outputs[state] is not None:
+            return outputs[state]
+    return None
+
+
+class Matcher:
+    """
+    Aho-Corasick automata over the bytes of a set of patterns, one reading forwards and one
+    reading the patterns and lines backwards. Each scan stops at the first match, so finding the
+    first and last digit of a line only reads as far as them from each end.
+    No pattern contains another, so the first match to end is also the first to start,
+    which lets overlaps like "eightwo" be read both ways.
+    """
+
+    def __init__(self, patterns: Dict[str, int]):
+        self.forwards = build_automaton(patterns)
+        self.backwards = build_automaton({word[::-1]: value for word, value in patterns.items()})
+
+    def first(self, line: Sequence[int]) -> Optional[int]:
+        return scan(self.forwards, line)
+
+    def last(self, line: Sequence[int]) -> Optional[int]:
+        return scan(self.backwards, reversed(line))
+
+
+PART1_MATCHER = Matcher(DIGITS)
+PART2_MATCHER = Matcher({**DIGITS, **WORD_REPLACEMENTS})
+
+
+def calibration_value(matcher: Matcher, line: Sequence[int]) -> int:
+    first = matcher.first(line)
+    if first is None:
+        return 0
+    last = matcher.last(line)
+    # Whatever matched first also matches from the end
+    assert last is not None
+    return first * 10 + last
+
+
+# Bytes of the file given to numpy at once, keeping its temporary arrays a bounded size
+NUMPY_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+def part1_numpy_chunk(chunk) -> int:
+    """
+    Sum of the part 1 calibration values of whole lines in a uint8 array, all computed in bulk
+    """
+    newlines = np.flatnonzero(chunk == ord("\n"))
+    line_starts = np.concatenate(([0], newlines + 1))
+    line_ends = np.concatenate((newlines, [len(chunk)]))
+    digit_positions = np.flatnonzero((chunk >= ord("0")) & (chunk <= ord("9")))
+    if not len(digit_positions):
+        return 0
+
+    # The first digit at or after each line's start, and the last before its end
+    first = np.searchsorted(digit_positions, line_starts)
+    last = np.searchsorted(digit_positions, line_ends) - 1
+    # Lines without a digit find the next line's first digit, or run off the end
+    has_digit = first <= last
+    first_digits = chunk[digit_positions[first[has_digit]]].astype(np.int64) - ord("0")
+    last_digits = chunk[digit_positions[last[has_digit]]].astype(np.int64) - ord("0")
+    return int((first_digits * 10 + last_digits).sum())
+
+
+def part1_numpy(data: puzzle_input.Buffer, chunk_size: int = NUMPY_CHUNK_SIZE) -> int:
+    """
+    Sum of the part 1 calibration values in 'data', splitting it into chunks on line boundaries
+    """
+    total = 0
+    start = 0
+    while start < len(data):
+        end = min(start + chunk_size, len(data))
+        if end < len(data):
+            # Finish the chunk at its last newline, or the end of a line longer than a chunk
+            newline = data.rfind(b"\n", start, end)
+            if newline == -1:
+                newline = data.find(b"\n", end)
+            end = len(data) if newline == -1 else newline + 1
+        chunk = np.frombuffer(data, dtype=np.uint8, count=end - start, offset=start)
+        total += part1_numpy_chunk(chunk)
+        start = end
+    return total
+
+
 def puzzle(filename):
     sum_part1 = 0
     sum_part2 = 0
-    with open(filename, "r") as f:
-        for line in f:
-            part1_digits = []
-            part2_digits = []
-            for i in range(len(line)):
-                char = line[i]
-                if '0' <= char <= '9':
-                    value = int(char)
-                    part1_digits.append(value)
-                    part2_digits.append(value)
-                    continue
-
-                for string, digit in WORD_REPLACEMENTS.items():
-                    if line[i:].startswith(string):
-                        part2_digits.append(digit)
-                        break
-
-            sum_part1 += part1_digits[0] * 10 + part1_digits[-1] if part1_digits else 0
-            sum_part2 += part2_digits[0] * 10 + part2_digits[-1]
+    lines = 0
+    # Part 1 only needs the ASCII digits, which numpy can find over the whole mapped file at once
+    use_numpy = np is not None and puzzle_input.is_path(filename)
+    if use_numpy:
+        with instrument.timer("day01.part1_numpy"), puzzle_input.mapped(filename) as data:
+            sum_part1 = part1_numpy(data)
+
+    with instrument.timer("day01.scan"):
+        for lines, line in enumerate(puzzle_input.lines(filename), start=1):
+            if not use_numpy:
+                sum_part1 += calibration_value(PART1_MATCHER, line)
+            sum_part2 += calibration_value(PART2_MATCHER, line)
+    instrument.count("day01.lines", lines)
 
     return (sum_part1, sum_part2)
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser()
-    parser.add_argument("filename")
-    args = parser.parse_args()
-    print(puzzle(args.filename))
+    batch.main(puzzle)
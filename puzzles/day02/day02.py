@@ -1,6 +1,13 @@
-import argparse
-from dataclasses import dataclass
-from typing import List, Type
+import sys
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Tuple, Type
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+# pylint: disable-next=wrong-import-position
+from puzzles.common import batch, instrument, puzzle_input  # noqa: E402
 
 
 @dataclass
@@ -60,28 +67,127 @@ class Game:
         )
 
 
+@dataclass
+class GameColumns:
+    """
+    Each game's id and the most cubes of each color it revealed, which is all either part needs,
+    stored in typed arrays rather than as Game and CubeSet objects
+    """
+    game_ids: array = field(default_factory=lambda: array("q"))
+    max_red: array = field(default_factory=lambda: array("q"))
+    max_green: array = field(default_factory=lambda: array("q"))
+    max_blue: array = field(default_factory=lambda: array("q"))
+
+    @classmethod
+    def from_lines(cls: Type["GameColumns"], lines: Iterable[bytes]) -> "GameColumns":
+        columns = GameColumns()
+        for line in lines:
+            columns.append_line(bytes(line))
+        return columns
+
+    def append_line(self, line: bytes) -> None:
+        header, reveals = line.split(b":", 1)
+        # Example reveals: b' 3 blue, 4 red; 1 red, 2 green'
+        # Splitting on whitespace alternates amounts with colors, trailing ',' or ';' included
+        words = reveals.split()
+        maxima = {ord("r"): 0, ord("g"): 0, ord("b"): 0}
+        for amount_str, color in zip(words[::2], words[1::2]):
+            amount = int(amount_str)
+            if amount > maxima[color[0]]:
+                maxima[color[0]] = amount
+        self.game_ids.append(int(header[len(b"Game "):]))
+        self.max_red.append(maxima[ord("r")])
+        self.max_green.append(maxima[ord("g")])
+        self.max_blue.append(maxima[ord("b")])
+
+    def __len__(self) -> int:
+        return len(self.game_ids)
+
+    def possible_id_sum(self, bag: CubeSet) -> int:
+        return sum((
+            game_id
+            for game_id, red, green, blue in zip(
+                self.game_ids, self.max_red, self.max_green, self.max_blue,
+            )
+            if red <= bag.red and green <= bag.green and blue <= bag.blue
+        ))
+
+    def power_sum(self) -> int:
+        return sum(map(lambda red, green, blue: red * green * blue,
+                       self.max_red, self.max_green, self.max_blue))
+
+
+class BagIndex:
+    """
+    Answers which games are possible for many different bags without rescanning the games.
+
+    A game is possible with a bag when its minimum cube set fits inside the bag on every color,
+    so each query counts the games dominated by a point in 3D. Every distinct maximum is given a
+    rank on its color's axis, and cumulative tables of game count and id sum over those ranks are
+    built once. A query then finds its rank on each axis by bisection and reads a single cell.
+    The tables have a cell for every combination of distinct maxima, which stays small because
+    cube counts only take a few values.
+    """
+
+    def __init__(self, games: GameColumns):
+        self.reds = sorted(set(games.max_red))
+        self.greens = sorted(set(games.max_green))
+        self.blues = sorted(set(games.max_blue))
+        # Rank 0 on each axis means the bag holds fewer cubes than any game needs
+        self.blue_stride = 1
+        self.green_stride = len(self.blues) + 1
+        self.red_stride = self.green_stride * (len(self.greens) + 1)
+        size = self.red_stride * (len(self.reds) + 1)
+        self.counts = [0] * size
+        self.id_sums = [0] * size
+
+        for game_id, red, green, blue in zip(
+            games.game_ids, games.max_red, games.max_green, games.max_blue,
+        ):
+            cell = self.cell(red, green, blue)
+            self.counts[cell] += 1
+            self.id_sums[cell] += game_id
+        self.accumulate(self.blue_stride, len(self.blues) + 1)
+        self.accumulate(self.green_stride, len(self.greens) + 1)
+        self.accumulate(self.red_stride, len(self.reds) + 1)
+
+    def cell(self, red: int, green: int, blue: int) -> int:
+        return (
+            bisect_right(self.reds, red) * self.red_stride
+            + bisect_right(self.greens, green) * self.green_stride
+            + bisect_right(self.blues, blue) * self.blue_stride
+        )
+
+    def accumulate(self, stride: int, axis_length: int) -> None:
+        # Add each cell's predecessor along one axis; cells at rank 0 on it have none
+        for index in range(len(self.counts)):
+            if (index // stride) % axis_length == 0:
+                continue
+            self.counts[index] += self.counts[index - stride]
+            self.id_sums[index] += self.id_sums[index - stride]
+
+    def query(self, bag: CubeSet) -> Tuple[int, int]:
+        """
+        (number of games possible with 'bag', sum of their ids)
+        """
+        cell = self.cell(bag.red, bag.green, bag.blue)
+        return self.counts[cell], self.id_sums[cell]
+
+    def query_many(self, bags: Iterable[CubeSet]) -> List[Tuple[int, int]]:
+        return [self.query(bag) for bag in bags]
+
+
 def puzzle(filename):
-    with open(filename, "r") as f:
-        games = [
-            Game.from_string(line.strip())
-            for line in f
-        ]
     part1_cubeset = CubeSet(red=12, green=13, blue=14)
-    part1 = sum((
-        g.game_id
-        for g in games
-        if g.cube_set_is_possible(part1_cubeset)
-    ))
-    part2 = sum((
-        g.minimum_cubeset_required().power
-        for g in games
-
-    ))
+    with instrument.timer("day02.parse"):
+        games = GameColumns.from_lines(puzzle_input.lines(filename))
+    instrument.count("day02.games", len(games))
+    with instrument.timer("day02.part1"):
+        part1 = games.possible_id_sum(part1_cubeset)
+    with instrument.timer("day02.part2"):
+        part2 = games.power_sum()
     return (part1, part2)
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser()
-    parser.add_argument("filename")
-    args = parser.parse_args()
-    print(puzzle(args.filename))
+    batch.main(puzzle)
@@ -1,18 +1,25 @@
-import argparse
-from typing import List, Set
+import operator
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
 
-class PartNumber:
-    max_part_id: int = 0
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+# pylint: disable-next=wrong-import-position
+from puzzles.common import batch, instrument, puzzle_input  # noqa: E402
 
-    def __init__(self):
-        self.value = 0
-        self.part_id = self.max_part_id
-        PartNumber.max_part_id += 1
 
-    @classmethod
-    def reset(cls):
-        cls.max_part_id = 0
+class PartNumber:
+    def __init__(self, part_id: int):
+        self.value = 0
+        self.part_id = part_id
+        # Whether any symbol touches this number, making it a part number
+        self.adjacent = False
 
     def __repr__(self) -> str:
         return f"{self.value:3d} ({self.part_id:03d})"
@@ -22,86 +29,271 @@ class PartNumber:
 
 
 class Symbol:
-    symbols: List["Symbol"] = []
-
     def __init__(self, symbol: str):
         self.symbol = symbol
         self.adjacent_parts: Set[PartNumber] = set()
-        Symbol.symbols.append(self)
-
-    @classmethod
-    def reset(cls):
-        cls.symbols = []
 
     def __repr__(self) -> str:
         return self.symbol
 
 
-def puzzle(filename: str):
-    PartNumber.reset()
-    Symbol.reset()
-    null_part = PartNumber()
-    null_symbol = Symbol('')
-    part_map: List[List[PartNumber]] = []
-    symbol_map: List[List[Symbol]] = []
-
-    with open(filename, "r") as f:
-        lines = f.readlines()
-
-    width = len(lines[0].strip())
-
-    for y, line in enumerate(lines):
-        part_map.append([])
-        symbol_map.append([])
-        current_part: PartNumber = null_part
-        for x, char in enumerate(line.strip()):
+@dataclass
+class Row:
+    # What's in each cell of the row, the null part or symbol where there's nothing
+    parts: List[PartNumber] = field(default_factory=list)
+    symbols: List[Symbol] = field(default_factory=list)
+    # Each number and symbol in the row once
+    part_numbers: List[PartNumber] = field(default_factory=list)
+    found_symbols: List[Symbol] = field(default_factory=list)
+
+
+class Schematic:
+    """
+    Scans a schematic one row at a time, totalling the answers as it goes.
+
+    A number and a symbol are connected when whichever of them is scanned second looks at the
+    cells before it: the three above and the one to the left. Nothing can connect to a row after
+    the row below it has been scanned, so at that point its part numbers and gears are added to
+    the totals and the row is dropped. Only two rows are ever held, however tall the schematic.
+    Every solve has its own, so several schematics can be solved at once from different threads.
+    """
+
+    def __init__(self):
+        self.part_count = 0
+        self.symbol_count = 0
+        self.null_part = self.new_part()
+        self.null_symbol = Symbol('')
+        self.previous = Row()
+        self.part1 = 0
+        self.part2 = 0
+
+    def new_part(self) -> PartNumber:
+        part = PartNumber(self.part_count)
+        self.part_count += 1
+        return part
+
+    def connect(self, part: PartNumber, symbol: Symbol) -> None:
+        if part is self.null_part or symbol is self.null_symbol:
+            return
+        part.adjacent = True
+        symbol.adjacent_parts.add(part)
+
+    def add_digit(self, row: Row, x: int, digit: int) -> None:
+        part = row.parts[-1] if x else self.null_part
+        if part is self.null_part:
+            part = self.new_part()
+            row.part_numbers.append(part)
+        part.value = part.value * 10 + digit
+        for symbol in self.previous.symbols[max(x-1, 0):x+2] + row.symbols[max(x-1, 0):x]:
+            self.connect(part, symbol)
+        row.parts.append(part)
+        row.symbols.append(self.null_symbol)
+
+    def add_symbol(self, row: Row, x: int, char: str) -> None:
+        symbol = self.null_symbol
+        if char != '.':
+            symbol = Symbol(char)
+            row.found_symbols.append(symbol)
+            for part in self.previous.parts[max(x-1, 0):x+2] + row.parts[max(x-1, 0):x]:
+                self.connect(part, symbol)
+        row.parts.append(self.null_part)
+        row.symbols.append(symbol)
+
+    def add_row(self, line: str) -> None:
+        row = Row()
+        for x, char in enumerate(line):
             if '0' <= char <= '9':
-                symbol_map[-1].append(null_symbol)
-                if current_part == null_part:
-                    current_part = PartNumber()
-                current_part.value = current_part.value*10 + (ord(char) - ord('0'))
-                for check_x, check_y in ((x-1, y-1), (x, y-1), (x+1, y-1), (x-1, y)):
-                    if check_x < 0 or check_y < 0 or check_x >= width:
-                        continue
-                    symbol = symbol_map[check_y][check_x]
-                    if symbol == null_symbol:
-                        continue
-                    symbol.adjacent_parts.add(current_part)
+                self.add_digit(row, x, ord(char) - ord('0'))
             else:
-                symbol = Symbol(char)
-                for check_x, check_y in ((x-1, y-1), (x, y-1), (x+1, y-1), (x-1, y)):
-                    if check_x < 0 or check_y < 0 or check_x >= width:
-                        continue
-                    part = part_map[check_y][check_x]
-                    if part == null_part:
-                        continue
-                    symbol.adjacent_parts.add(part)
-                symbol_map[-1].append(symbol)
-                current_part = null_part
-            part_map[-1].append(current_part)
-
-    all_adjacent = {
-        part
-        for symbol in Symbol.symbols
-        for part in symbol.adjacent_parts
-        if symbol.symbol != '.' and symbol != null_symbol
-    }
-    part1 = sum((part.value for part in all_adjacent))
-
-    part2 = 0
-    for symbol in Symbol.symbols:
-        if symbol.symbol != "*":
-            continue
-        if len(symbol.adjacent_parts) != 2:
-            continue
-        a, b = list(symbol.adjacent_parts)
-        part2 += a.value * b.value
-
-    return (part1, part2)
+                self.add_symbol(row, x, char)
+        self.complete(self.previous)
+        self.previous = row
+
+    def complete(self, row: Row) -> None:
+        """
+        Add a row which can't gain any more connections to the totals
+        """
+        self.symbol_count += len(row.found_symbols)
+        self.part1 += sum((part.value for part in row.part_numbers if part.adjacent))
+        for symbol in row.found_symbols:
+            if symbol.symbol == "*" and len(symbol.adjacent_parts) == 2:
+                a, b = symbol.adjacent_parts
+                self.part2 += a.value * b.value
+
+    def finish(self) -> None:
+        self.complete(self.previous)
+        self.previous = Row()
+
+
+# Longest number whose digits are summed in int64, longer ones are read as Python ints
+NUMPY_MAX_DIGITS = 18
+# Roughly how much of the file is turned into arrays at once. Working arrays take many times this
+NUMPY_BAND_BYTES = 1024 * 1024
+
+
+def row_layout(data: puzzle_input.Buffer) -> Tuple[int, int, int]:
+    """
+    (bytes per row including the line ending, cells per row, number of rows) of a schematic
+    """
+    newline = data.find(b"\n")
+    if newline == -1:
+        return len(data), len(data), 1 if data else 0
+    row_length = newline + 1
+    width = newline - 1 if newline and data[newline - 1] == ord("\r") else newline
+    return row_length, width, -(-len(data) // row_length)
+
+
+def grid_band(data: puzzle_input.Buffer, start_row: int, end_row: int):
+    """
+    Rows start_row to end_row of the schematic as a 2D uint8 array, without their line endings
+    """
+    row_length, width, _ = row_layout(data)
+    offset = start_row * row_length
+    cells = np.frombuffer(
+        data, dtype=np.uint8, count=min(end_row * row_length, len(data)) - offset, offset=offset,
+    )
+    # Pad out the last row's missing line ending so that every row is the same length
+    padding = -len(cells) % row_length
+    if padding:
+        cells = np.concatenate((cells, np.full(padding, ord("\n"), dtype=np.uint8)))
+    return cells.reshape(-1, row_length)[:, :width]
+
+
+def neighbourhood(mask):
+    """
+    Every cell of the boolean 'mask' or next to one, counting diagonals
+    """
+    padded = np.pad(mask, 1)
+    height, width = mask.shape
+    dilated = np.zeros_like(mask)
+    for dy in range(3):
+        for dx in range(3):
+            dilated |= padded[dy:dy+height, dx:dx+width]
+    return dilated
+
+
+def label_numbers(grid):
+    """
+    (label of the number in each cell or 0, value of each label) with numbers labelled from 1
+    """
+    digits = (grid >= ord("0")) & (grid <= ord("9"))
+    before = np.pad(digits, ((0, 0), (1, 0)))[:, :-1]
+    after = np.pad(digits, ((0, 0), (0, 1)))[:, 1:]
+    starts = (digits & ~before).ravel()
+    ends = (digits & ~after).ravel()
+    flat_digits = digits.ravel()
+
+    labels = np.cumsum(starts) * flat_digits
+    labels_shape = labels.reshape(grid.shape)
+    positions = np.flatnonzero(flat_digits)
+    if not len(positions):
+        return labels_shape, np.zeros(1, dtype=np.int64)
+
+    # Each digit is worth 10 to the power of how far it is from the end of its number
+    start_positions = np.flatnonzero(starts)
+    end_positions = np.concatenate(([0], np.flatnonzero(ends)))
+    powers = end_positions[labels[positions]] - positions
+    place_values = np.power(10, np.minimum(powers, NUMPY_MAX_DIGITS - 1), dtype=np.int64)
+    digit_values = (grid.ravel()[positions] - ord("0")).astype(np.int64) * place_values
+    # The digits of each number are next to each other, so it's a run of digit_values
+    number_starts = np.searchsorted(positions, start_positions)
+    values = np.concatenate(([0], np.add.reduceat(digit_values, number_starts)))
+
+    long_numbers = np.flatnonzero(end_positions[1:] - start_positions >= NUMPY_MAX_DIGITS) + 1
+    if len(long_numbers):
+        # Too long for int64, so these few are read as Python ints instead
+        values = values.astype(object)
+        flat_grid = grid.ravel()
+        for label in long_numbers.tolist():
+            values[label] = int(flat_grid[start_positions[label - 1]:end_positions[label] + 1]
+                                .tobytes())
+    return labels_shape, values
+
+
+def gear_ratios(grid, labels, values, first: int = 0, last: Optional[int] = None) -> int:
+    """
+    Sum of the gear ratios of the gears in rows 'first' to 'last' of the grid
+    """
+    # The labels of the 8 cells around each '*', as a row per gear
+    padded = np.pad(labels, 1)
+    gear_y, gear_x = np.nonzero(grid[first:last] == ord("*"))
+    gear_y += first
+    around = np.stack([
+        padded[gear_y + dy, gear_x + dx]
+        for dy in range(3)
+        for dx in range(3)
+        if (dy, dx) != (1, 1)
+    ], axis=1)
+    # Count the distinct numbers around each gear after sorting its row
+    around.sort(axis=1)
+    distinct = (around[:, :1] != 0).sum(axis=1) + (
+        (around[:, 1:] != around[:, :-1]) & (around[:, 1:] != 0)
+    ).sum(axis=1)
+    pairs = around[distinct == 2]
+    if not len(pairs):
+        return 0
+    # The two numbers are the largest label and the smallest non-zero label
+    smallest = np.where(pairs == 0, pairs.max(axis=1, keepdims=True), pairs).min(axis=1)
+    # Summed as Python ints, which can't overflow however big the numbers are
+    return sum(map(operator.mul, values[smallest].tolist(), values[pairs[:, -1]].tolist()))
+
+
+def band_totals(grid, first: int, last: int) -> Tuple[int, int, int, int]:
+    """
+    (part 1, part 2, symbols, numbers) for the numbers and gears in rows 'first' to 'last' of the
+    grid. The grid also has the rows either side of them, so that everything they touch can be seen
+    """
+    digits = (grid >= ord("0")) & (grid <= ord("9"))
+    # Line endings left in a short last row aren't symbols
+    symbols = ~digits & (grid != ord(".")) & (grid > ord(" "))
+    labels, values = label_numbers(grid)
+    part_cells = (neighbourhood(symbols) & digits)[first:last]
+    part_labels = np.unique(labels[first:last][part_cells])
+    part1 = sum(values[part_labels].tolist())
+    part2 = gear_ratios(grid, labels, values, first, last)
+    # Numbers are labelled in order, so the band's own are those after the row above's
+    numbers = int(labels[:last].max(initial=0)) - int(labels[:first].max(initial=0))
+    return part1, part2, int(symbols[first:last].sum()), numbers
+
+
+def puzzle_numpy(
+    data: puzzle_input.Buffer, band_bytes: int = NUMPY_BAND_BYTES,
+) -> Tuple[int, int]:
+    """
+    Solve the schematic with array operations rather than cell by cell. It's split into bands of
+    rows, each overlapping its neighbours by a row, so memory stays bounded for any size of file
+    """
+    row_length, _, height = row_layout(data)
+    band_rows = max(1, band_bytes // max(row_length, 1))
+    totals = [0, 0, 0, 0]
+    for start in range(0, height, band_rows):
+        end = min(start + band_rows, height)
+        above = max(start - 1, 0)
+        grid = grid_band(data, above, min(end + 1, height))
+        for index, total in enumerate(band_totals(grid, start - above, end - above)):
+            totals[index] += total
+    part1, part2, symbols, numbers = totals
+    instrument.count("day03.symbols", symbols)
+    instrument.count("day03.part_numbers", numbers)
+    return part1, part2
+
+
+def puzzle(filename: str):
+    if np is not None and puzzle_input.is_path(filename):
+        with instrument.timer("day03.numpy"), puzzle_input.mapped(filename) as data:
+            return puzzle_numpy(data)
+
+    schematic = Schematic()
+    with instrument.timer("day03.scan"):
+        for line in puzzle_input.lines(filename):
+            schematic.add_row(str(line, "ascii").strip())
+        schematic.finish()
+
+    instrument.count("day03.symbols", schematic.symbol_count)
+    # Not counting the null part
+    instrument.count("day03.part_numbers", schematic.part_count - 1)
+    return (schematic.part1, schematic.part2)
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser()
-    parser.add_argument("filename")
-    args = parser.parse_args()
-    print(puzzle(args.filename))
+    batch.main(puzzle)
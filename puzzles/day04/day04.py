@@ -1,6 +1,26 @@
-import argparse
+import sys
+from collections import deque
+from itertools import islice
 from dataclasses import dataclass, field
-from typing import List
+from pathlib import Path
+from typing import Deque, Iterable, Iterator, List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+# pylint: disable-next=wrong-import-position
+from puzzles.common import batch, instrument, puzzle_input  # noqa: E402
+
+
+def number_mask(numbers: Iterable[int]) -> int:
+    # Card numbers are small, so a set of them fits in an int with a bit per number
+    mask = 0
+    for number in numbers:
+        mask |= 1 << number
+    return mask
 
 
 @dataclass
@@ -13,10 +33,9 @@ class Card:
     count: int = field(init=False, default=1)
 
     def __post_init__(self):
-        self.wins = sum((
-            1 if num in self.winning_numbers else 0
-            for num in self.our_numbers
-        ))
+        # Each of our numbers counts, even a repeated one
+        winning = number_mask(self.winning_numbers)
+        self.wins = sum(winning >> number & 1 for number in self.our_numbers)
         self.score = 2**(self.wins-1) if self.wins else 0
 
     @staticmethod
@@ -34,21 +53,122 @@ class Card:
         )
 
 
-def puzzle(filename):
-    with open(filename, "r") as f:
-        cards = [Card.from_line(line) for line in f.readlines()]
-    part1 = sum((card.score for card in cards))
+# Cards parsed into one array at a time, keeping the arrays a bounded size
+NUMPY_CHUNK_CARDS = 65536
+
+
+def uniform_layout(bodies: List[bytes], bar: int) -> bool:
+    """
+    Whether every card body is laid out alike: the same length, with the | in the same place and
+    the same count of numbers either side of it
+    """
+    width = len(bodies[0])
+    if bar == -1 or any(len(body) != width for body in bodies):
+        return False
+    cells = np.frombuffer(b"".join(bodies), dtype=np.uint8).reshape(len(bodies), width)
+    if not (cells[:, bar] == ord("|")).all():
+        return False
+    # A number starts at each digit that doesn't follow another digit
+    digits = (cells >= ord("0")) & (cells <= ord("9"))
+    starts = digits & ~np.pad(digits, ((0, 0), (1, 0)))[:, :-1]
+    counts = np.stack((starts[:, :bar].sum(axis=1), starts[:, bar:].sum(axis=1)), axis=1)
+    return bool((counts == counts[0]).all())
+
+
+def chunk_wins(lines: List[bytes]):
+    """
+    The wins of each card in 'lines', parsed into a 2D array of numbers and counted in bulk.
+    Chunks whose cards aren't all laid out alike are parsed a card at a time instead
+    """
+    bodies = [line.partition(b":")[2] for line in lines]
+    bar = bodies[0].find(b"|")
+    if not uniform_layout(bodies, bar):
+        return np.array([Card.from_line(str(line, "ascii")).wins for line in lines], dtype=np.int64)
+    winning_count = len(bodies[0][:bar].split())
+    numbers = np.fromstring(
+        b" ".join(bodies).replace(b"|", b" "), dtype=np.int64, sep=" ",
+    ).reshape(len(bodies), -1)
+
+    # Mark each card's winning numbers in a row of flags, then count our numbers that are marked
+    rows = np.arange(len(bodies))[:, np.newaxis]
+    winning = np.zeros((len(bodies), numbers.max() + 1), dtype=bool)
+    winning[rows, numbers[:, :winning_count]] = True
+    return winning[rows, numbers[:, winning_count:]].sum(axis=1)
+
+
+def card_wins_numpy(lines: Iterable[bytes]) -> Iterator:
+    """
+    Arrays of the wins of each card, a chunk of cards at a time
+    """
+    lines = iter(lines)
+    while chunk := [bytes(line) for line in islice(lines, NUMPY_CHUNK_CARDS)]:
+        yield chunk_wins(chunk)
 
-    for index, card in enumerate(cards):
-        for bonus_card in cards[index+1:index+1+card.wins]:
-            bonus_card.count += card.count
-    part2 = sum((card.count for card in cards))
+
+# Most wins whose scores can be added up in int64: 65536 cards of up to 2**39 is under 2**63
+NUMPY_MAX_WINS = 40
+
+
+def scores_numpy(wins) -> int:
+    if len(wins) and wins.max() > NUMPY_MAX_WINS:
+        # Scores this big need Python ints, as Card.score uses
+        return sum(1 << (card_wins - 1) for card_wins in wins.tolist() if card_wins)
+    return int(np.where(wins > 0, 1 << np.maximum(wins - 1, 0), 0).sum())
+
+
+class CopyCascade:
+    """
+    Works out how many copies of each card there are, as the cards are read in order.
+
+    A card adds its copies to a run of the cards after it, which is recorded as a difference
+    array: its count is added where the run starts and taken away after the run ends. Keeping a
+    running total of the differences gives the copies won for each card, so every card costs the
+    same however many it wins. Cards only win copies of the few cards after them, so only a window
+    of differences as wide as the most wins is ever kept.
+    """
+
+    def __init__(self):
+        # Copies of the next card won by the cards before it
+        self.won_copies = 0
+        # Changes to won_copies, starting with the card after the next one
+        self.differences: Deque[int] = deque()
+
+    def add(self, wins: int) -> int:
+        """
+        Add the next card, returning how many copies of it there are
+        """
+        count = 1 + self.won_copies
+        if wins:
+            while len(self.differences) <= wins:
+                self.differences.append(0)
+            self.differences[0] += count
+            self.differences[wins] -= count
+        if self.differences:
+            self.won_copies += self.differences.popleft()
+        return count
+
+
+def puzzle(filename):
+    part1 = 0
+    part2 = 0
+    cards = 0
+    cascade = CopyCascade()
+    lines = puzzle_input.lines(filename)
+    with instrument.timer("day04.scan"):
+        if np is not None:
+            for wins in card_wins_numpy(lines):
+                cards += len(wins)
+                part1 += scores_numpy(wins)
+                part2 += sum(map(cascade.add, wins.tolist()))
+        else:
+            for cards, line in enumerate(lines, start=1):
+                card = Card.from_line(str(line, "ascii"))
+                part1 += card.score
+                part2 += cascade.add(card.wins)
+    instrument.count("day04.cards", cards)
 
     return (part1, part2)
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser()
-    parser.add_argument("filename")
-    args = parser.parse_args()
-    print(puzzle(args.filename))
+    batch.main(puzzle)
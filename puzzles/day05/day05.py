@@ -1,6 +1,19 @@
-import argparse
+import sys
+from array import array
+from bisect import bisect_right, insort
 from dataclasses import dataclass, field
-from typing import List, Tuple
+from functools import cached_property
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+# pylint: disable-next=wrong-import-position
+from puzzles.common import batch, instrument, puzzle_input  # noqa: E402
 
 
 @dataclass
@@ -50,37 +63,276 @@ class Mapping:
         return lower_unmapped, mapped, upper_unmapped
 
 
+class RangeSet:
+    """
+    Sorted, disjoint ranges held as parallel arrays of lower and upper bounds.
+    Overlapping and touching ranges are merged as the set is built, so converting a set through
+    several maps never holds more ranges than there are distinct breakpoints between them.
+    """
+
+    def __init__(self, bounds: Iterable[Tuple[int, int]] = ()):
+        self.lowers = array("q")
+        self.uppers = array("q")
+        for lower, upper in sorted(bounds):
+            if upper <= lower:
+                continue
+            if self.uppers and lower <= self.uppers[-1]:
+                self.uppers[-1] = max(self.uppers[-1], upper)
+            else:
+                self.lowers.append(lower)
+                self.uppers.append(upper)
+
+    @staticmethod
+    def from_ranges(ranges: Iterable[Range]) -> "RangeSet":
+        return RangeSet((r.lower, r.upper) for r in ranges)
+
+    def bounds(self) -> Iterator[Tuple[int, int]]:
+        return zip(self.lowers, self.uppers)
+
+    def __iter__(self) -> Iterator[Range]:
+        return (Range(lower, upper) for lower, upper in self.bounds())
+
+    def __len__(self) -> int:
+        return len(self.lowers)
+
+    def intersection(self, other: "RangeSet") -> "RangeSet":
+        return RangeSet(
+            (max(lower, other_lower), min(upper, other_upper))
+            for lower, upper in self.bounds()
+            for other_lower, other_upper in other.overlapping(lower, upper)
+        )
+
+    def overlapping(self, lower: int, upper: int) -> Iterator[Tuple[int, int]]:
+        """
+        The ranges in the set overlapping lower up to upper
+        """
+        index = bisect_right(self.uppers, lower)
+        while index < len(self) and self.lowers[index] < upper:
+            yield self.lowers[index], self.uppers[index]
+            index += 1
+
+
+# Start of the first piece of every function, below any number in an almanac
+LOWEST = -2**63
+# End of the last piece of every function, above any number in an almanac
+HIGHEST = 2**63 - 1
+
+
+class PiecewiseLinear:
+    """
+    A function over the integers made of pieces that each add an offset. Piece i covers
+    starts[i] up to starts[i+1] and adds offsets[i], and the first piece starts at LOWEST.
+    Neighbouring pieces never share an offset, so every start is a real breakpoint.
+    """
+
+    def __init__(self, pieces: Iterable[Tuple[int, int]]):
+        self.starts = array("q")
+        self.offsets = array("q")
+        for start, offset in pieces:
+            assert not self.starts or start >= self.starts[-1], f"{start=} is out of order"
+            if self.starts and start == self.starts[-1]:
+                # A later piece starting at the same place replaces an empty one
+                self.offsets[-1] = offset
+            elif not self.offsets or offset != self.offsets[-1]:
+                self.starts.append(start)
+                self.offsets.append(offset)
+            if len(self.offsets) > 1 and self.offsets[-1] == self.offsets[-2]:
+                self.starts.pop()
+                self.offsets.pop()
+        assert self.starts[0] == LOWEST
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __call__(self, value: int) -> int:
+        return value + self.offsets[bisect_right(self.starts, value) - 1]
+
+    def piece_bounds(self, lower: int, upper: int) -> Iterator[Tuple[int, int, int]]:
+        """
+        (lower, upper, offset) of the part of lower up to upper covered by each piece
+        """
+        index = bisect_right(self.starts, lower) - 1
+        while lower < upper:
+            part_upper = upper
+            if index + 1 < len(self.starts):
+                part_upper = min(upper, self.starts[index + 1])
+            yield lower, part_upper, self.offsets[index]
+            lower = part_upper
+            index += 1
+
+    def image(self, src: Range) -> List[Range]:
+        return [
+            Range(lower + offset, upper + offset)
+            for lower, upper, offset in self.piece_bounds(src.lower, src.upper)
+        ]
+
+    def image_set(self, src: "RangeSet") -> "RangeSet":
+        return RangeSet(
+            (lower + offset, upper + offset)
+            for src_lower, src_upper in src.bounds()
+            for lower, upper, offset in self.piece_bounds(src_lower, src_upper)
+        )
+
+    def minimum(self, src: Range) -> int:
+        """
+        The smallest value taken over 'src'. Each piece is increasing, so only the start of 'src'
+        and the breakpoints inside it need checking
+        """
+        return min(lower + offset for lower, _, offset in self.piece_bounds(src.lower, src.upper))
+
+    def then(self, other: "PiecewiseLinear") -> "PiecewiseLinear":
+        """
+        The function applying this one and then 'other'
+        """
+        def pieces() -> Iterable[Tuple[int, int]]:
+            for index, (start, offset) in enumerate(zip(self.starts, self.offsets)):
+                # Split this piece wherever its outputs cross one of other's breakpoints
+                end = self.starts[index + 1] if index + 1 < len(self.starts) else None
+                other_index = bisect_right(other.starts, start + offset) - 1
+                yield start, offset + other.offsets[other_index]
+                for other_index in range(other_index + 1, len(other.starts)):
+                    other_start = other.starts[other_index] - offset
+                    if end is not None and other_start >= end:
+                        break
+                    yield other_start, offset + other.offsets[other_index]
+
+        return PiecewiseLinear(pieces())
+
+    def apply_many(self, values: Sequence[int]) -> List[int]:
+        """
+        The function applied to every one of 'values', vectorized when numpy is available
+        """
+        if np is None:
+            return [self(value) for value in values]
+        starts = np.frombuffer(self.starts, dtype=np.int64)
+        offsets = np.frombuffer(self.offsets, dtype=np.int64)
+        array_values = np.asarray(values, dtype=np.int64)
+        indexes = np.searchsorted(starts, array_values, side="right") - 1
+        return (array_values + offsets[indexes]).tolist()
+
+    def inverse(self) -> "InverseFunction":
+        ends = list(self.starts[1:]) + [HIGHEST]
+        return InverseFunction(zip(self.starts, ends, self.offsets))
+
+
+class InverseFunction:
+    """
+    Maps outputs of a PiecewiseLinear function back to its inputs. Each piece's outputs are
+    its inputs shifted by its offset, so the inverse has the same pieces sorted by their outputs.
+    Almanac maps leave unmapped numbers alone, so several pieces can share outputs and a
+    location can come from more than one seed.
+    """
+
+    def __init__(self, pieces: Iterable[Tuple[int, int, int]]):
+        # (output lower, output upper, offset) of each piece, by output. These can overflow an
+        # int64 array for the unbounded first and last pieces, so they're held in lists
+        outputs = sorted((start + offset, end + offset, offset) for start, end, offset in pieces)
+        self.lowers = [lower for lower, _, _ in outputs]
+        self.uppers = [upper for _, upper, _ in outputs]
+        self.offsets = [offset for _, _, offset in outputs]
+
+    def preimage(self, outputs: Range) -> RangeSet:
+        """
+        Every input mapped into 'outputs'
+        """
+        # Pieces can overlap, so every piece starting before the end of 'outputs' is checked
+        end = bisect_right(self.lowers, outputs.upper - 1)
+        return RangeSet(
+            (max(lower, outputs.lower) - offset, min(upper, outputs.upper) - offset)
+            for lower, upper, offset in zip(self.lowers[:end], self.uppers[:end], self.offsets)
+        )
+
+    def lowest_output(self, inputs: RangeSet) -> Optional[int]:
+        """
+        The lowest output of any of 'inputs'. Pieces are walked upwards from the lowest outputs,
+        stopping as soon as no later piece can produce anything lower than the best found
+        """
+        best = None
+        for lower, upper, offset in zip(self.lowers, self.uppers, self.offsets):
+            if best is not None and lower >= best:
+                break
+            first_input = next(inputs.overlapping(lower - offset, upper - offset), None)
+            if first_input is not None:
+                output = max(first_input[0], lower - offset) + offset
+                best = output if best is None else min(best, output)
+        return best
+
+
+def unclaimed(
+    lower: int, upper: int, claimed: Sequence[Tuple[int, int, int]],
+) -> Iterator[Tuple[int, int]]:
+    """
+    The parts of lower up to upper outside every one of the sorted, disjoint 'claimed' ranges
+    """
+    for claimed_lower, claimed_upper, _ in claimed:
+        if claimed_lower >= upper:
+            break
+        if claimed_upper > lower:
+            if claimed_lower > lower:
+                yield lower, claimed_lower
+            lower = max(lower, claimed_upper)
+    if lower < upper:
+        yield lower, upper
+
+
 @dataclass
 class Map:
     name: str
     mappings: List[Mapping]
+    # The mappings sorted by source with the gaps between them filled by identity segments, so
+    # that a range is converted with a bisect and a sweep over only the segments it overlaps
+    segments: PiecewiseLinear = field(init=False, repr=False, compare=False)
+    # Built once, so that counting is free while instrumentation is off
+    ranges_counter: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.segments = self.to_function()
+        self.ranges_counter = f"day05.{self.name}.ranges"
 
     @staticmethod
     def from_block(block: str) -> "Map":
         name, *lines = block.split("\n")
         return Map(name.split()[0], list(map(Mapping.from_line, lines)))
 
-    def convert_src_to_dst(self, src: Range) -> List[Range]:
-        done: List[Range] = []
-        todo = [src]
+    def claimed_sources(self) -> List[Tuple[int, int, int]]:
+        """
+        (lower, upper, offset) of the source numbers each mapping converts, sorted and disjoint.
+        Where mappings overlap the one listed first wins, as it would converting one at a time
+        """
+        claimed: List[Tuple[int, int, int]] = []
         for mapping in self.mappings:
-            next_todo = []
-            for range in todo:
-                lower_unmapped, mapped, upper_unmapped = mapping.convert_src_to_dst(range)
-                if mapped.length > 0:
-                    done.append(mapped)
-                if lower_unmapped.length > 0:
-                    next_todo.append(lower_unmapped)
-                if upper_unmapped.length > 0:
-                    next_todo.append(upper_unmapped)
-                assert lower_unmapped.length or mapped.length or upper_unmapped.length
-            todo = next_todo
-        done.extend(todo)
+            source = mapping.source_range
+            offset = mapping.destination_range.lower - source.lower
+            for lower, upper in list(unclaimed(source.lower, source.upper, claimed)):
+                insort(claimed, (lower, upper, offset))
+        return claimed
+
+    def to_function(self) -> PiecewiseLinear:
+        def pieces() -> Iterable[Tuple[int, int]]:
+            yield LOWEST, 0
+            for lower, upper, offset in self.claimed_sources():
+                yield lower, offset
+                # Unmapped numbers are unchanged, unless the next mapping starts here
+                yield upper, 0
+
+        return PiecewiseLinear(pieces())
+
+    def convert_src_to_dst(self, src: Range) -> List[Range]:
+        done = self.segments.image(src)
+        instrument.count(self.ranges_counter, len(done))
 
         lengths = sum((r.length for r in done))
         assert lengths == src.length, f"{lengths=} != {src.length=}"
         return done
 
+    def inverse(self) -> InverseFunction:
+        return self.segments.inverse()
+
+    def convert_ranges(self, src: RangeSet) -> RangeSet:
+        done = self.segments.image_set(src)
+        instrument.count(self.ranges_counter, len(done))
+        return done
+
 
 @dataclass
 class Almanac:
@@ -90,7 +342,11 @@ class Almanac:
 
     @staticmethod
     def from_content(content: str) -> "Almanac":
-        seeds_section, *map_sections = content.split("\n\n")
+        return Almanac.from_sections(content.split("\n\n"))
+
+    @staticmethod
+    def from_sections(sections: Iterable[str]) -> "Almanac":
+        seeds_section, *map_sections = sections
         seed_ints = list(map(int, seeds_section.split()[1:]))
         part1_seeds = [Range(s, s+1) for s in seed_ints]
         part2_seeds = [Range(seed_ints[i], seed_ints[i] + seed_ints[i+1]) for i in range(0, len(seed_ints), 2)]
@@ -100,36 +356,73 @@ class Almanac:
             list(map(Map.from_block, map_sections)),
         )
 
+    @cached_property
+    def location_function(self) -> PiecewiseLinear:
+        """
+        Every map composed into a single function from seed to location
+        """
+        function = self.maps[0].segments
+        for mapp in self.maps[1:]:
+            function = function.then(mapp.segments)
+        instrument.count("day05.location_pieces", len(function))
+        return function
+
     def convert(self, seed: Range) -> List[Range]:
-        seeds = [seed]
+        return list(self.location_function.image_set(RangeSet.from_ranges([seed])))
+
+    def convert_ranges(self, seeds: Iterable[Range]) -> RangeSet:
+        """
+        The locations of all of 'seeds', converted one map at a time without composing them
+        """
+        ranges = RangeSet.from_ranges(seeds)
         for mapp in self.maps:
-            next_seeds = []
-            for s in seeds:
-                next_seeds.extend(mapp.convert_src_to_dst(s))
-            seeds = next_seeds
-        return seeds
+            ranges = mapp.convert_ranges(ranges)
+        return ranges
+
+    def lowest_location(self, seed: Range) -> int:
+        return self.location_function.minimum(seed)
+
+    def locations(self, seeds: Sequence[int]) -> List[int]:
+        """
+        The location of every one of 'seeds', for answering many seeds in one call
+        """
+        return self.location_function.apply_many(seeds)
+
+    def lowest_locations(self, seeds: Iterable[Range]) -> List[int]:
+        return [self.location_function.minimum(seed) for seed in seeds]
+
+    @cached_property
+    def inverse_function(self) -> InverseFunction:
+        """
+        Location back to seed, the inverse of every map composed
+        """
+        return self.location_function.inverse()
+
+    def seeds_for_locations(self, locations: Range, seeds: Iterable[Range] = ()) -> RangeSet:
+        """
+        The seeds mapping into 'locations', only those among 'seeds' if any are given
+        """
+        preimage = self.inverse_function.preimage(locations)
+        seed_set = RangeSet.from_ranges(seeds)
+        return preimage.intersection(seed_set) if seed_set else preimage
+
+    def lowest_reachable_location(self, seeds: Iterable[Range]) -> Optional[int]:
+        return self.inverse_function.lowest_output(RangeSet.from_ranges(seeds))
 
 
 def puzzle(filename):
-    with open(filename, "r") as f:
-        almanac = Almanac.from_content(f.read())
-
-    part1 = min((
-        result.lower
-        for s in almanac.part1_seeds
-        for result in almanac.convert(s)
-    ))
-    part2 = min((
-        result.lower
-        for s in almanac.part2_seeds
-        for result in almanac.convert(s)
-    ))
+    with puzzle_input.mapped(filename) as data, instrument.timer("day05.parse"):
+        almanac = Almanac.from_sections(str(block, "ascii") for block in puzzle_input.iter_blocks(data))
+
+    # Composing the maps only pays off over many queries, for two it's quicker to convert
+    # the seeds one map at a time
+    with instrument.timer("day05.part1"):
+        part1 = almanac.convert_ranges(almanac.part1_seeds).lowers[0]
+    with instrument.timer("day05.part2"):
+        part2 = almanac.convert_ranges(almanac.part2_seeds).lowers[0]
 
     return (part1, part2)
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser()
-    parser.add_argument("filename")
-    args = parser.parse_args()
-    print(puzzle(args.filename))
+    batch.main(puzzle)
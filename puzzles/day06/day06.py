@@ -1,67 +1,114 @@
-import argparse
 import math
-
-
-def get_score_for_hold_time(race_time, hold_time):
-    return (float(race_time) - float(hold_time)) * float(hold_time)
-
-
-def get_hold_times_for_score(race_time, score):
-    race_time = float(race_time)
-    modifier = math.sqrt(race_time*race_time - 4.0 * score)
-    return (race_time - modifier) / 2.0, (race_time + modifier) / 2.0
-
-
-def get_best_hold_time(race_time):
-    best_hold_float = float(race_time) / 2.0
-    floor = math.floor(best_hold_float)
-    ceil = math.ceil(best_hold_float)
-
-    score_for_floor = get_score_for_hold_time(race_time, floor)
-    score_for_ceil = get_score_for_hold_time(race_time, ceil)
-
-    if score_for_floor > score_for_ceil:
-        return floor
-    else:
-        return ceil
-
-
-def get_distance_for_best_hold_time(race_time):
-    # Theoretically it is race_time * race_time / 4, however we are limited to integer holding times
-    return get_score_for_hold_time(race_time, get_best_hold_time(race_time))
-
-
-def get_better_hold_times(race_time, distance_record):
-    record_hold_times = get_hold_times_for_score(race_time, distance_record)
-    best_score_possible = get_distance_for_best_hold_time(race_time)
-
-    if best_score_possible <= distance_record:
+import sys
+from pathlib import Path
+from typing import List, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+# pylint: disable-next=wrong-import-position
+from puzzles.common import batch, instrument, puzzle_input  # noqa: E402
+
+
+def beats_record(race_time: int, record: int, hold_time: int) -> bool:
+    return hold_time * (race_time - hold_time) > record
+
+
+def first_winning_hold_time(race_time: int, record: int, root: int) -> int:
+    """
+    The shortest hold time beating 'record', or one past race_time / 2 when none does,
+    given root = isqrt(race_time**2 - 4 * record)
+    """
+    # The exact boundary is (race_time - sqrt(discriminant)) / 2, which rounding and the integer
+    # square root can leave at most a step or two away from
+    hold_time = (race_time - root) // 2
+    while hold_time > 0 and beats_record(race_time, record, hold_time - 1):
+        hold_time -= 1
+    # Hold times only get worse past race_time / 2
+    while 2 * hold_time <= race_time and not beats_record(race_time, record, hold_time):
+        hold_time += 1
+    return hold_time
+
+
+def ways_to_win(race_time: int, record: int) -> int:
+    """
+    How many whole hold times travel further than 'record'. Holding for h goes h * (race_time - h),
+    which beats the record between the roots of h**2 - race_time*h + record. Everything is
+    done in integers, so the answer is exact however large the numbers are.
+    """
+    discriminant = race_time * race_time - 4 * record
+    if discriminant <= 0:
+        # At best the record is matched, not beaten
         return 0
-
-    # Doesn't seem to hold for record hold times both at the same number, ceil(4-1) = 3, floor(4+1) = 5
-    return math.ceil(record_hold_times[1] - 1) - math.floor(record_hold_times[0] + 1) + 1
+    shortest = first_winning_hold_time(race_time, record, math.isqrt(discriminant))
+    # Winning hold times are symmetric around race_time / 2
+    return max(0, race_time - 2 * shortest + 1)
+
+
+# Bounds that keep race_time**2 and 4 * record inside an int64
+NUMPY_MAX_TIME = 2**31
+NUMPY_MAX_RECORD = 2**60
+
+
+def ways_to_win_numpy(race_times, records):
+    """
+    ways_to_win() for arrays of int64 races, with float square roots corrected to be exact
+    """
+    discriminants = race_times * race_times - 4 * records
+    roots = np.sqrt(np.maximum(discriminants, 0).astype(np.float64)).astype(np.int64)
+    # Step the float root to isqrt: it can only be off by one for values this small
+    roots -= roots * roots > discriminants
+    roots += (roots + 1) * (roots + 1) <= discriminants
+
+    shortest = (race_times - roots) // 2
+    for _ in range(2):
+        earlier = np.maximum(shortest - 1, 0)
+        shortest -= (shortest > 0) & (earlier * (race_times - earlier) > records)
+    for _ in range(2):
+        shortest += shortest * (race_times - shortest) <= records
+
+    ways = np.maximum(race_times - 2 * shortest + 1, 0)
+    return np.where(discriminants > 0, ways, 0)
+
+
+def ways_to_win_many(race_times: Sequence[int], records: Sequence[int]) -> List[int]:
+    """
+    ways_to_win() for every race, vectorized when numpy is available and the numbers fit
+    """
+    fits_numpy = np is not None and len(race_times) > 0 and (
+        0 <= min(race_times) and max(race_times) <= NUMPY_MAX_TIME
+        and 0 <= min(records) and max(records) <= NUMPY_MAX_RECORD
+    )
+    if not fits_numpy:
+        return [ways_to_win(race_time, record) for race_time, record in zip(race_times, records)]
+    return ways_to_win_numpy(
+        np.asarray(race_times, dtype=np.int64), np.asarray(records, dtype=np.int64),
+    ).tolist()
 
 
 def puzzle(filename):
-    with open(filename, "r") as f:
-        _, *times = f.readline().strip().split()
-        _, *distances = f.readline().strip().split()
-    part1_times = map(int, times)
+    with puzzle_input.mapped(filename) as data, instrument.timer("day06.parse"):
+        # Anything after the two lines of the sheet, like a trailing blank line, is ignored
+        lines = puzzle_input.iter_lines(data)
+        time_line, distance_line = next(lines), next(lines)
+        _, *times = str(time_line, "ascii").split()
+        _, *distances = str(distance_line, "ascii").split()
+    part1_times = list(map(int, times))
     part2_time = int("".join(times))
-    part1_distances = map(int, distances)
+    part1_distances = list(map(int, distances))
     part2_distance = int("".join(distances))
 
-    part1 = 1
-    for (race_time, distance_record) in zip(part1_times, part1_distances):
-        part1 *= get_better_hold_times(race_time, distance_record)
+    with instrument.timer("day06.part1"):
+        part1 = math.prod(ways_to_win_many(part1_times, part1_distances))
 
-    part2 = get_better_hold_times(part2_time, part2_distance)
+    with instrument.timer("day06.part2"):
+        part2 = ways_to_win(part2_time, part2_distance)
 
     return (part1, part2)
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser()
-    parser.add_argument("filename")
-    args = parser.parse_args()
-    print(puzzle(args.filename))
+    batch.main(puzzle)
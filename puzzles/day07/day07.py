@@ -1,5 +1,18 @@
 import sys
+from array import array
 from collections import Counter
+from itertools import combinations_with_replacement
+from pathlib import Path
+from typing import Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+# pylint: disable-next=wrong-import-position
+from puzzles.common import batch, instrument, puzzle_input  # noqa: E402
 
 
 # Converts 2-9,T,J,Q,K,A to 2-9,a,b,c,d,e so that strings
@@ -11,10 +24,6 @@ SORTABLE_CARD_TRANSLATION = {
     ord('K'): ord('d'),
     ord('A'): ord('e'),
 }
-# For part 2 the joker is converted to the lowest value
-PART2_JOKER_TRANSLATION = {
-    ord('b'): ord('0'),
-}
 
 
 FIVE_OF_A_KIND = '7'
@@ -53,54 +62,93 @@ def hand_type(card_counter):
             assert False, "Unknown hand type"
 
 
+def joker_hand_type(card_counter):
+    # Jokers join the most common other card, which always makes the best hand
+    joker_count = card_counter["J"]
+    if joker_count in (0, 5):
+        return hand_type(card_counter)
+    others = card_counter.copy()
+    del others["J"]
+    others[others.most_common()[0][0]] += joker_count
+    return hand_type(others)
+
+
+CARDS = b"23456789TJQKA"
+# Cards as base 13 digits, in order of value. In part 2 the joker is the lowest
+PART1_DIGITS = bytes.maketrans(CARDS, b"0123456789abc")
+PART2_DIGITS = bytes.maketrans(b"J23456789TQKA", b"0123456789abc")
+# Hand types rank above every arrangement of five cards
+HAND_TYPE_SCALE = 13**5
+
+# (part 1 type, part 2 type) of every multiset of five cards, by its cards sorted.
+# The types are 0 for high card up to 6 for five of a kind
+HAND_TYPES = {
+    "".join(cards).encode("ascii"): (
+        int(hand_type(Counter(cards))) - 1,
+        int(joker_hand_type(Counter(cards))) - 1,
+    )
+    # Combinations of sorted cards come out sorted too
+    for cards in combinations_with_replacement(sorted(CARDS.decode("ascii")), 5)
+}
+
+
+def hand_keys(cards: bytes) -> Tuple[int, int]:
+    """
+    Integers ordering a hand by type then by its cards, for part 1 and part 2
+    """
+    part1_type, part2_type = HAND_TYPES[bytes(sorted(cards))]
+    return (
+        part1_type * HAND_TYPE_SCALE + int(cards.translate(PART1_DIGITS), 13),
+        part2_type * HAND_TYPE_SCALE + int(cards.translate(PART2_DIGITS), 13),
+    )
+
+
 class Hand:
     def __init__(self, line):
         # Example line: '32T3K 765'
         cards, bid = line.split()
         self.bid = int(bid)
-        translated_cards = cards.translate(SORTABLE_CARD_TRANSLATION)
-
-        # Part 1, prefix hand type to translated cards to make a value which can be used to sort
-        card_counter = Counter(cards)
-        hand_type_part1 = hand_type(card_counter)
-        self.sortable_cards_part1 = hand_type_part1 + translated_cards
-
-        # Part 2, add the joker count to the most common other card, then do the same thing as part 1
-        joker_count = card_counter["J"]
-        if joker_count == 0:
-            # No changes, re-use result
-            self.sortable_cards_part2 = self.sortable_cards_part1
-        elif joker_count == 5:
-            # All jokers, 5 of a kind
-            self.sortable_cards_part2 = FIVE_OF_A_KIND + '00000'
-        else:
-            del card_counter["J"]
-            card_counter[card_counter.most_common()[0][0]] += joker_count
-            hand_type_part2 = hand_type(card_counter)
-            self.sortable_cards_part2 = hand_type_part2 + translated_cards.translate(PART2_JOKER_TRANSLATION)
+        self.key_part1, self.key_part2 = hand_keys(cards.encode("ascii"))
+
+
+def total_winnings(keys: array, bids: array) -> int:
+    """
+    Sum of each bid times its rank, with hands ranked by 'keys'
+    """
+    if np is not None:
+        order = np.argsort(np.frombuffer(keys, dtype=np.int64), kind="stable")
+        ranks = np.arange(1, len(keys) + 1, dtype=np.int64)
+        return int((np.frombuffer(bids, dtype=np.int64)[order] * ranks).sum())
+    # Both sorts are stable so identical hands keep their order either way
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    return sum((
+        (index+1) * bids[hand]
+        for index, hand in enumerate(order)
+    ))
 
 
 def puzzle(filename):
-    with open(filename, "r") as f:
-        hands = [Hand(line) for line in f.readlines()]
-
-    part1_sorted = sorted(hands, key=lambda h: h.sortable_cards_part1)
-    part1 = sum((
-        (index+1) * hand.bid
-        for index, hand in enumerate(part1_sorted)
-    ))
-
-    part2_sorted = sorted(hands, key=lambda h: h.sortable_cards_part2)
-    part2 = sum((
-        (index+1) * hand.bid
-        for index, hand in enumerate(part2_sorted)
-    ))
+    # Ranking needs every hand at once, so keep just the keys and bid of each in typed arrays
+    keys_part1 = array("q")
+    keys_part2 = array("q")
+    bids = array("q")
+    with instrument.timer("day07.parse"):
+        for line in puzzle_input.lines(filename):
+            cards, bid = bytes(line).split()
+            key_part1, key_part2 = hand_keys(cards)
+            keys_part1.append(key_part1)
+            keys_part2.append(key_part2)
+            bids.append(int(bid))
+    instrument.count("day07.hands", len(bids))
+
+    with instrument.timer("day07.part1"):
+        part1 = total_winnings(keys_part1, bids)
+
+    with instrument.timer("day07.part2"):
+        part2 = total_winnings(keys_part2, bids)
 
     return (part1, part2)
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: day07.py FILENAME\nPrints '(part 1 answer, part 2 answer)'")
-        sys.exit(1)
-    print(puzzle(sys.argv[1]))
+    batch.main(puzzle)
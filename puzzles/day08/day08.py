@@ -1,9 +1,14 @@
-import argparse
 import math
 import re
+import sys
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+# pylint: disable-next=wrong-import-position
+from puzzles.common import batch, instrument, puzzle_input  # noqa: E402
+
 
 RULE_RE = re.compile(r"(?P<name>[A-Z0-9]+) = \((?P<left_name>[A-Z0-9]+), ?(?P<right_name>[A-Z0-9]+)\)")
 
@@ -55,10 +60,10 @@ class PathTracker:
 
 
 def puzzle(filename: str) -> Tuple[int, int]:
-    with open(filename, "r") as f:
-        instructions, _, *rule_lines = f.read().split("\n")
-    instruction_count = len(instructions)
-    rules = Rule.from_lines(rule_lines)
+    with puzzle_input.mapped(filename) as data, instrument.timer("day08.parse"):
+        instructions, _, *rule_lines = (str(line, "ascii") for line in puzzle_input.iter_lines(data))
+        instruction_count = len(instructions)
+        rules = Rule.from_lines(rule_lines)
 
     start_rules = [
         rule
@@ -69,25 +74,27 @@ def puzzle(filename: str) -> Tuple[int, int]:
     part1 = 0
     path_lengths = []
 
-    for start_rule in start_rules:
-        node = start_rule
-        instruction_index = 0
-        seen: Dict[Tuple[Rule, int], int] = {}
-        while True:
-            if node == node.left == node.right:
-                break
-            instruction_offset = instruction_index % instruction_count
-            instruction = instructions[instruction_offset]
-            state = (node, instruction_offset)
-            if state in seen:
-                break
-            seen[state] = instruction_index
-            node = node.left if instruction == "L" else node.right
-            instruction_index += 1
-            if node.name.endswith("Z"):
-                path_lengths.append(instruction_index)
-                if node.name.endswith("ZZZ"):
-                    part1 = instruction_index
+    with instrument.timer("day08.walk"):
+        for start_rule in start_rules:
+            node = start_rule
+            instruction_index = 0
+            seen: Dict[Tuple[Rule, int], int] = {}
+            while True:
+                if node == node.left == node.right:
+                    break
+                instruction_offset = instruction_index % instruction_count
+                instruction = instructions[instruction_offset]
+                state = (node, instruction_offset)
+                if state in seen:
+                    break
+                seen[state] = instruction_index
+                node = node.left if instruction == "L" else node.right
+                instruction_index += 1
+                if node.name.endswith("Z"):
+                    path_lengths.append(instruction_index)
+                    if node.name.endswith("ZZZ"):
+                        part1 = instruction_index
+            instrument.count("day08.states_seen", len(seen))
 
     part2 = math.lcm(*path_lengths)
 
@@ -95,7 +102,4 @@ def puzzle(filename: str) -> Tuple[int, int]:
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser()
-    parser.add_argument("filename")
-    args = parser.parse_args()
-    print(puzzle(args.filename))
+    batch.main(puzzle)
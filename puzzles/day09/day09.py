@@ -1,6 +1,11 @@
 import sys
+from pathlib import Path
 from typing import List
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+# pylint: disable-next=wrong-import-position
+from puzzles.common import batch, instrument, puzzle_input  # noqa: E402
+
 
 def get_diffs(history: List[int]) -> List:
     return [history[i+1] - history[i] for i in range(len(history)-1)]
@@ -38,22 +43,23 @@ def predict_backwards(history_derivatives) -> List[List[int]]:
 
 
 def puzzle(filename):
-    with open(filename, encoding="utf-8") as f:
-        histories = [[int(part) for part in line.strip().split()] for line in f.readlines()]
-
-    for history in histories:
-        history_derivatives = generate_derivatives(history)
-        history_derivatives = predict_forwards(history_derivatives)
-        history_derivatives = predict_backwards(history_derivatives)
-
-    part1 = sum(history[-1] for history in histories)
-    part2 = sum(history[0] for history in histories)
+    part1 = 0
+    part2 = 0
+    # Each history is predicted as soon as it's parsed so only one is held at a time
+    with instrument.timer("day09.predict"):
+        for line in puzzle_input.lines(filename):
+            history = [int(part) for part in bytes(line).split()]
+            history_derivatives = generate_derivatives(history)
+            instrument.count("day09.derivatives", len(history_derivatives))
+            history_derivatives = predict_forwards(history_derivatives)
+            history_derivatives = predict_backwards(history_derivatives)
+            part1 += history[-1]
+            part2 += history[0]
     return (part1, part2)
 
 
 def main():
-    result = puzzle(sys.argv[1])
-    print(f"{result[0]}, {result[1]}")
+    batch.main(puzzle, batch.comma_separated)
 
 
 if __name__ == "__main__":
@@ -1,7 +1,12 @@
 import sys
 import textwrap
 from dataclasses import dataclass
-from typing import List, Tuple
+from pathlib import Path
+from typing import Iterable, List, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+# pylint: disable-next=wrong-import-position
+from puzzles.common import batch, instrument, puzzle_input  # noqa: E402
 
 
 # North, South, East, West
@@ -29,6 +34,8 @@ NSEW_VALUES = {
     "S": EMPTY,
 }
 NSEW_CHARS = {value: key for key, value in NSEW_VALUES.items()}
+# NSEW_VALUES indexed by the byte value of each character
+NSEW_BYTE_VALUES = [NSEW_VALUES.get(chr(byte), EMPTY) for byte in range(256)]
 
 
 @dataclass
@@ -40,15 +47,26 @@ class Network:
 
     @staticmethod
     def from_text(text: str) -> "Network":
-        width = text.find("\n") + 2
-        text = text.replace("\n", "..")
-        text = f"{'.' * width}.{text}.{'.' * width}"
-        height = len(text) // width
-        start_index = text.find("S")
-        pipes: List[int] = []
+        return Network.from_lines(text.encode().split(b"\n"))
 
-        for char in text:
-            pipes.append(NSEW_VALUES[char])
+    @staticmethod
+    def from_lines(lines: Iterable[bytes]) -> "Network":
+        # Surround the grid with a border of empty tiles so that neighbours never go out of bounds
+        pipes: List[int] = []
+        width = 0
+        start_index = -1
+        for line in lines:
+            row = bytes(line)
+            if not width:
+                width = len(row) + 2
+                pipes.extend([EMPTY] * width)
+            if start_index < 0 and b"S" in row:
+                start_index = len(pipes) + 1 + row.find(b"S")
+            pipes.append(EMPTY)
+            pipes.extend([NSEW_BYTE_VALUES[char] for char in row])
+            pipes.append(EMPTY)
+        pipes.extend([EMPTY] * width)
+        height = len(pipes) // width
 
         left = bool(pipes[start_index-1] & RIGHT)
         right = bool(pipes[start_index+1] & LEFT)
@@ -114,7 +132,8 @@ class Network:
 
         # part 1 is half the length of the path
         part1 = fill_grid.bit_count() // 2
-        part2 = self.count_inside(fill_grid, left_grid, right_grid)
+        with instrument.timer("day10.count_inside"):
+            part2 = self.count_inside(fill_grid, left_grid, right_grid)
 
         return part1, part2
 
@@ -151,14 +170,14 @@ class Network:
 
 
 def puzzle(filename):
-    with open(filename, encoding="utf-8") as f:
-        pipes = Network.from_text(f.read())
-    return pipes.fill()
+    with instrument.timer("day10.parse"):
+        pipes = Network.from_lines(puzzle_input.lines(filename))
+    with instrument.timer("day10.fill"):
+        return pipes.fill()
 
 
 def main():
-    result = puzzle(sys.argv[1])
-    print(f"{result[0]}, {result[1]}")
+    batch.main(puzzle, batch.comma_separated)
 
 
 if __name__ == "__main__":
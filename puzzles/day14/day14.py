@@ -1,12 +1,31 @@
-import argparse
+import sys
 import textwrap
 from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+# pylint: disable-next=wrong-import-position
+from puzzles.common import batch, instrument, puzzle_input  # noqa: E402
 
 
 SLIDER_CHAR = "O"
 BLOCKER_CHAR = "#"
 
 
+def bit_table(char: str) -> bytes:
+    """
+    A bytes.translate table turning a row into binary digits, 1 wherever 'char' is
+    """
+    table = bytearray(b"0" * 256)
+    table[ord(char)] = ord("1")
+    return bytes(table)
+
+
+SLIDER_BITS = bit_table(SLIDER_CHAR)
+BLOCKER_BITS = bit_table(BLOCKER_CHAR)
+
+
 @dataclass
 class Grid:
     """
@@ -31,25 +50,26 @@ class Grid:
 
     @staticmethod
     def from_text(content: str) -> "Grid":
-        width = content.find("\n")
-        content = content.replace("\n", "")
+        return Grid.from_lines(content.encode().splitlines())
 
-        grid_sliders = int(content[0] == SLIDER_CHAR)
-        grid_blockers = int(content[0] == BLOCKER_CHAR)
-
-        for char in content[1:]:
-            grid_sliders <<= 1
-            grid_blockers <<= 1
-            if char == SLIDER_CHAR:
-                grid_sliders += 1
-            elif char == BLOCKER_CHAR:
-                grid_blockers += 1
+    @staticmethod
+    def from_lines(lines: Iterable[bytes]) -> "Grid":
+        # The first character of the grid ends up as the most significant bit
+        slider_rows = []
+        blocker_rows = []
+        for line in lines:
+            row = bytes(line)
+            if not row:
+                # A blank line at the end of the input isn't a row of the grid
+                continue
+            slider_rows.append(row.translate(SLIDER_BITS))
+            blocker_rows.append(row.translate(BLOCKER_BITS))
 
         return Grid(
-            width=width,
-            height=len(content) // width,
-            sliders=grid_sliders,
-            not_blockers=~grid_blockers,
+            width=len(slider_rows[0]),
+            height=len(slider_rows),
+            sliders=int(b"".join(slider_rows), 2),
+            not_blockers=~int(b"".join(blocker_rows), 2),
         )
 
     def __post_init__(self):
@@ -81,9 +101,12 @@ class Grid:
         Call 'func' until slider state stops changing
         """
         previous_state = 0
+        steps = 0
         while previous_state != self.sliders:
             previous_state = self.sliders
             func()
+            steps += 1
+        instrument.count("day14.tilt_steps", steps)
 
     def cycle(self):
         self.tilt(self.step_north)
@@ -148,35 +171,34 @@ class Grid:
 
 
 def puzzle(filename):
-    with open(filename, encoding="utf-8") as f:
-        grid = Grid.from_text(f.read())
+    with instrument.timer("day14.parse"):
+        grid = Grid.from_lines(puzzle_input.lines(filename))
 
     # Part 1
-    grid.tilt(grid.step_north)
-    part1 = grid.north_load()
+    with instrument.timer("day14.part1"):
+        grid.tilt(grid.step_north)
+        part1 = grid.north_load()
 
     # Part 2, no need to reset the grid because we start with north anyway
-    state_lookup = {}
-    iterations = int(1e9)
-    iteration = 0
-    while iteration < iterations:
-        if grid.sliders in state_lookup:
-            length = iteration - state_lookup[grid.sliders]
-            iteration += ((iterations - iteration) // length) * length
-        state_lookup[grid.sliders] = iteration
-        grid.cycle()
-        iteration += 1
-    part2 = grid.north_load()
+    with instrument.timer("day14.part2"):
+        state_lookup = {}
+        iterations = int(1e9)
+        iteration = 0
+        while iteration < iterations:
+            if grid.sliders in state_lookup:
+                length = iteration - state_lookup[grid.sliders]
+                iteration += ((iterations - iteration) // length) * length
+            state_lookup[grid.sliders] = iteration
+            grid.cycle()
+            iteration += 1
+        part2 = grid.north_load()
+        instrument.count("day14.cycles", len(state_lookup))
 
     return (part1, part2)
 
 
 def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("filename")
-    args = parser.parse_args()
-    result = puzzle(args.filename)
-    print(f"{result[0]}, {result[1]}")
+    batch.main(puzzle, batch.comma_separated)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,14 @@
-import argparse
 import math
+import sys
 from collections import deque
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Dict, List, Iterable, Set
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+# pylint: disable-next=wrong-import-position
+from puzzles.common import batch, instrument, puzzle_input  # noqa: E402
+
 LOW_PULSE = False
 HIGH_PULSE = True
 BUTTON = "button"
@@ -113,11 +118,15 @@ class Circuit:
 
     @staticmethod
     def from_text(text: str) -> "Circuit":
+        return Circuit.from_lines(text.splitlines())
+
+    @staticmethod
+    def from_lines(lines: Iterable[str]) -> "Circuit":
         component_types: Dict[str, str] = {}
         component_inputs: Dict[str, List[str]] = {}
         component_outputs: Dict[str, List[str]] = {}
 
-        for line in text.splitlines():
+        for line in lines:
             # Break the line in parts: 'component_part -> output_part'
             component_part, _, output_part = line.strip().split(maxsplit=2)
             c_name = component_part[1:]  # The broadcaster's is name 'roadcaster', I'm ok with this
@@ -174,6 +183,7 @@ class Circuit:
                     continue
                 new_pulses = self.components[pulse.to_name].pulse(pulse)
                 pulse_queue.extend(new_pulses)
+        instrument.count("day20.part1_pulses", counter[HIGH_PULSE] + counter[LOW_PULSE])
         return counter[HIGH_PULSE] * counter[LOW_PULSE]
 
     def part2(self) -> int:
@@ -228,22 +238,22 @@ class Circuit:
                 pulse_queue.extend(new_pulses)
             state = self.ff_state(flip_flops)
 
+        instrument.count("day20.periodicity_presses", iteration)
         return iteration
 
 
 def puzzle(filename):
-    with open(filename, encoding="utf-8") as f:
-        circuit = Circuit.from_text(f.read())
-    part1 = circuit.part1(1000)
-    part2 = circuit.part2()
+    with instrument.timer("day20.parse"):
+        circuit = Circuit.from_lines(str(line, "ascii") for line in puzzle_input.lines(filename))
+    with instrument.timer("day20.part1"):
+        part1 = circuit.part1(1000)
+    with instrument.timer("day20.part2"):
+        part2 = circuit.part2()
     return part1, part2
 
 
 def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("filename")
-    result = puzzle(parser.parse_args().filename)
-    print(f"{result[0]}, {result[1]}")
+    batch.main(puzzle, batch.comma_separated)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,53 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from puzzles.common import batch
+from puzzles.day07 import day07
+
+TEST_INPUT = str(Path("puzzles/day07/test_input.txt").resolve())
+
+
+@pytest.fixture(autouse=True)
+def no_cache(monkeypatch):
+    monkeypatch.setenv("AOC2023_NO_CACHE", "1")
+
+
+def test_input_files_directory(tmp_path):
+    (tmp_path / "b.txt").write_text("")
+    (tmp_path / "a.txt").write_text("")
+    (tmp_path / "subdir").mkdir()
+    assert batch.input_files(str(tmp_path)) == [str(tmp_path / "a.txt"), str(tmp_path / "b.txt")]
+
+
+def test_input_files_manifest(tmp_path):
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("# comment\nb.txt\n\n/abs/a.txt\n")
+    assert batch.input_files(str(manifest)) == [str(tmp_path / "b.txt"), "/abs/a.txt"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run(tmp_path, workers):
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text(f"{TEST_INPUT}\nmissing.txt\n{TEST_INPUT}\n")
+    out = io.StringIO()
+    assert not batch.run(day07.puzzle, str(manifest), workers, out)
+
+    responses = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert responses[0] == {"filename": TEST_INPUT, "result": [6440, 5905]}
+    assert responses[1]["filename"] == str(tmp_path / "missing.txt")
+    assert responses[1]["error"].startswith("FileNotFoundError")
+    assert responses[2] == responses[0]
+
+
+def test_run_skips_cache(tmp_path, monkeypatch):
+    monkeypatch.delenv("AOC2023_NO_CACHE")
+    # One-off batch inputs shouldn't be hashed or fill the cache
+    monkeypatch.setattr(batch.cache, "solve", pytest.fail)
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text(f"{TEST_INPUT}\n")
+    out = io.StringIO()
+    assert batch.run(day07.puzzle, str(manifest), 1, out)
+    assert json.loads(out.getvalue()) == {"filename": TEST_INPUT, "result": [6440, 5905]}
@@ -0,0 +1,23 @@
+from benchmarks.bench import compare, percentile
+
+
+def test_percentile():
+    samples = [5.0, 1.0, 4.0, 2.0, 3.0]
+    assert percentile(samples, 0.5) == 3.0
+    assert percentile(samples, 0.95) == 5.0
+    assert percentile([7.0], 0.95) == 7.0
+
+
+def test_compare():
+    baseline = {
+        "day01/input.txt": {"median": 1.0},
+        "day02/input.txt": {"median": 1.0},
+        "day20/test_input.txt": {"error": "AssertionError"},
+    }
+    results = {
+        "day01/input.txt": {"median": 1.05},
+        "day02/input.txt": {"median": 1.2},
+        "day03/input.txt": {"median": 9.0},
+        "day20/test_input.txt": {"error": "AssertionError"},
+    }
+    assert compare(results, baseline, 0.1) == ["day02/input.txt"]
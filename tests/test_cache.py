@@ -0,0 +1,87 @@
+import os
+from typing import List
+
+from puzzles.common import cache as cache_module
+from puzzles.common.cache import ResultCache
+
+
+calls: List[str] = []
+
+
+def fake_puzzle(filename):
+    calls.append(filename)
+    with open(filename, encoding="utf-8") as f:
+        return (len(f.read()), 2)
+
+
+def test_cache_hit(tmp_path):
+    calls.clear()
+    filename = tmp_path / "input.txt"
+    filename.write_text("abc")
+    cache = ResultCache(tmp_path / "cache")
+
+    assert cache.solve(fake_puzzle, str(filename)) == (3, 2)
+    assert cache.solve(fake_puzzle, str(filename)) == (3, 2)
+    assert len(calls) == 1
+
+    # Changing the input invalidates the entry
+    filename.write_text("abcd")
+    assert cache.solve(fake_puzzle, str(filename)) == (4, 2)
+    assert len(calls) == 2
+
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    cache.put("old", (1, 2))
+    size = os.path.getsize(tmp_path / "cache" / "old.json")
+    cache.max_bytes = 2 * size
+
+    cache.put("newer", (3, 4))
+    os.utime(tmp_path / "cache" / "old.json", (0, 0))
+    os.utime(tmp_path / "cache" / "newer.json", (1, 1))
+    # Reading an entry marks it as recently used
+    assert cache.get("old") == (1, 2)
+
+    cache.put("newest", (5, 6))
+    assert cache.get("newer") is None
+    assert cache.get("old") == (1, 2)
+    assert cache.get("newest") == (5, 6)
+
+
+def test_key_covers_shared_code(tmp_path, monkeypatch):
+    filename = tmp_path / "input.txt"
+    filename.write_text("abc")
+    cache = ResultCache(tmp_path / "cache")
+    key = cache.key(fake_puzzle, str(filename))
+
+    # A change to puzzles/common, e.g. the input parsing, must not reuse old answers
+    monkeypatch.setattr(cache_module, "hash_shared_sources", lambda: "edited")
+    assert cache.key(fake_puzzle, str(filename)) != key
+
+
+def test_key_covers_environment(tmp_path, monkeypatch):
+    filename = tmp_path / "input.txt"
+    filename.write_text("abc")
+    cache = ResultCache(tmp_path / "cache")
+    key = cache.key(fake_puzzle, str(filename))
+
+    # Answers found with numpy don't vouch for the pure Python engines, or the other way round
+    monkeypatch.setattr(cache_module, "environment", lambda: "no-numpy")
+    assert cache.key(fake_puzzle, str(filename)) != key
+
+
+def test_put_only_scans_when_full(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path / "cache")
+    scans = []
+    entries = cache.entries
+    monkeypatch.setattr(cache, "entries", lambda: scans.append(1) or entries())
+
+    for index in range(20):
+        cache.put(str(index), (index, index))
+    assert len(scans) == 1
+
+    cache.max_bytes = cache.total_bytes // 2
+    cache.put("last", (0, 0))
+    assert len(scans) == 2
+    assert cache.total_bytes <= cache.max_bytes
+    assert cache.get("last") == (0, 0)
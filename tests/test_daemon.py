@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+
+from puzzles import client, daemon
+
+
+@pytest.fixture(scope="module")
+def puzzles():
+    return daemon.load_puzzles()
+
+
+def test_solve_over_socket(tmp_path, puzzles):
+    socket_path = str(tmp_path / "daemon.sock")
+
+    def solve(day, filename):
+        # The client is blocking so it has to run outside the event loop
+        return asyncio.to_thread(client.solve, day, filename, socket_path)
+
+    async def run():
+        server = await daemon.start(socket_path, puzzles)
+        async with server:
+            first = await solve(7, "puzzles/day07/test_input.txt")
+            second = await solve(4, "puzzles/day04/test_input.txt")
+            with pytest.raises(RuntimeError, match="FileNotFoundError"):
+                await solve(4, "missing.txt")
+        return first, second
+
+    assert asyncio.run(run()) == ((6440, 5905), (13, 30))
+
+
+def test_unknown_day(puzzles):
+    response = daemon.handle_request(puzzles, b'{"day": 25, "filename": "x"}')
+    assert response == {"error": "KeyError: 25"}
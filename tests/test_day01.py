@@ -0,0 +1,24 @@
+import pytest
+
+from puzzles.day01 import day01
+
+
+@pytest.mark.parametrize("line,part1,part2", [
+    (b"two1nine", 11, 29),
+    (b"eightwothree", 0, 83),
+    (b"xtwone3four", 33, 24),
+    (b"zoneight234", 24, 14),
+    (b"oneight", 0, 18),
+    (b"sevenine", 0, 79),
+    (b"nothing", 0, 0),
+])
+def test_calibration_value(line, part1, part2):
+    assert day01.calibration_value(day01.PART1_MATCHER, line) == part1
+    assert day01.calibration_value(day01.PART2_MATCHER, line) == part2
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 16, day01.NUMPY_CHUNK_SIZE])
+def test_part1_numpy(chunk_size):
+    pytest.importorskip("numpy")
+    data = b"1abc2\npqr3stu8vwx\nnodigits\na1b2c3d4e5f\n\ntreb7uchet\r\n"
+    assert day01.part1_numpy(data, chunk_size) == 12 + 38 + 15 + 77
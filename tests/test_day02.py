@@ -0,0 +1,31 @@
+from puzzles.day02 import day02
+
+
+def test_game_columns():
+    games = day02.GameColumns.from_lines([
+        b"Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green",
+        b"Game 12: 8 green, 6 blue, 20 red; 5 blue, 4 red, 13 green; 5 green, 1 red",
+    ])
+    assert list(games.game_ids) == [1, 12]
+    assert list(games.max_red) == [4, 20]
+    assert list(games.max_green) == [2, 13]
+    assert list(games.max_blue) == [6, 6]
+    assert games.possible_id_sum(day02.CubeSet(red=12, green=13, blue=14)) == 1
+    assert games.power_sum() == 4 * 2 * 6 + 20 * 13 * 6
+
+
+def test_bag_index():
+    games = day02.GameColumns.from_lines([
+        b"Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green",
+        b"Game 2: 1 blue, 2 green; 3 green, 4 blue, 1 red; 1 green, 1 blue",
+        b"Game 3: 8 green, 6 blue, 20 red; 5 blue, 4 red, 13 green; 5 green, 1 red",
+        b"Game 4: 1 green, 3 red, 6 blue; 3 green, 6 red; 3 green, 15 blue, 14 red",
+        b"Game 5: 6 red, 1 blue, 3 green; 2 blue, 1 red, 2 green",
+    ])
+    index = day02.BagIndex(games)
+    assert index.query(day02.CubeSet(red=12, green=13, blue=14)) == (3, 8)
+    assert index.query_many([
+        day02.CubeSet(red=0, green=0, blue=0),
+        day02.CubeSet(red=6, green=3, blue=6),
+        day02.CubeSet(red=100, green=100, blue=100),
+    ]) == [(0, 0), (3, 8), (5, 15)]
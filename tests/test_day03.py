@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from puzzles.day03 import day03
+
+
+def test_concurrent_solves(monkeypatch):
+    # Without numpy every solve goes through its own Schematic
+    monkeypatch.setattr(day03, "np", None)
+    filenames = ["puzzles/day03/test_input.txt", "puzzles/day03/input.txt"] * 4
+    expected = [day03.puzzle(filename) for filename in filenames]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(day03.puzzle, filenames)) == expected
+    assert expected[0] == (4361, 467835)
+
+
+def test_schematic_rows():
+    schematic = day03.Schematic()
+    with open("puzzles/day03/test_input.txt", encoding="ascii") as f:
+        for line in f:
+            schematic.add_row(line.strip())
+            # The row just added is all that's kept
+            assert len(schematic.previous.parts) == len(line.strip())
+    schematic.finish()
+    assert (schematic.part1, schematic.part2) == (4361, 467835)
+
+
+@pytest.mark.parametrize("line_ending", [b"\n", b"\r\n"])
+def test_puzzle_numpy(line_ending):
+    pytest.importorskip("numpy")
+    with open("puzzles/day03/test_input.txt", "rb") as f:
+        data = f.read().replace(b"\n", line_ending)
+    assert day03.puzzle_numpy(data) == (4361, 467835)
+    assert day03.puzzle_numpy(data + line_ending) == (4361, 467835)
+    assert day03.puzzle_numpy(b"") == (0, 0)
+
+
+@pytest.mark.parametrize("band_bytes", [1, 23, 50, 10**6])
+def test_puzzle_numpy_bands(band_bytes):
+    pytest.importorskip("numpy")
+    with open("puzzles/day03/input.txt", "rb") as f:
+        data = f.read()
+    # Numbers and gears on the edge of a band must still see the rows either side of it
+    assert day03.puzzle_numpy(data, band_bytes) == (531561, 83279367)
+    assert day03.puzzle_numpy(data[:-1], band_bytes) == (531561, 83279367)
+
+
+def test_puzzle_numpy_long_numbers(tmp_path, monkeypatch):
+    pytest.importorskip("numpy")
+    # 18 digits fit in int64, the rest are beyond it and the products beyond any fixed width
+    data = (
+        b"123456789012345678.......\n"
+        b"..................*......\n"
+        b"1234567890123456789012345\n"
+        b"....#....................\n"
+        b"9999999999999999999......\n"
+    )
+    filename = tmp_path / "input.txt"
+    filename.write_bytes(data)
+    expected = day03.puzzle_numpy(data)
+    monkeypatch.setattr(day03, "np", None)
+    assert day03.puzzle(str(filename)) == expected
+    assert expected == (
+        123456789012345678 + 1234567890123456789012345 + 9999999999999999999,
+        123456789012345678 * 1234567890123456789012345,
+    )
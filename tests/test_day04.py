@@ -1,3 +1,5 @@
+import pytest
+
 from puzzles.day04 import day04
 
 
@@ -8,3 +10,58 @@ def test_card_parsing():
     assert card.our_numbers == [61, 30, 68, 82, 17, 32, 24, 19]
     assert card.wins == 2
     assert card.score == 2
+
+
+def test_puzzle_from_stream():
+    with open("puzzles/day04/test_input.txt", "rb") as f:
+        assert day04.puzzle(f) == (13, 30)
+
+
+def test_card_wins_numpy():
+    pytest.importorskip("numpy")
+    with open("puzzles/day04/test_input.txt", "rb") as f:
+        lines = f.read().splitlines()
+    wins = [
+        int(card_wins)
+        for chunk in day04.card_wins_numpy(lines)
+        for card_wins in chunk
+    ]
+    assert wins == [day04.Card.from_line(str(line, "ascii")).wins for line in lines]
+    assert day04.scores_numpy(day04.chunk_wins(lines)) == 13
+
+
+def test_copy_cascade():
+    cascade = day04.CopyCascade()
+    assert [cascade.add(wins) for wins in [4, 2, 2, 1, 0, 0]] == [1, 2, 4, 8, 14, 1]
+    # Nothing is kept beyond the cards that can still be won
+    assert not cascade.differences
+
+
+def test_repeated_numbers():
+    # Each of our numbers that wins counts, even if it's repeated
+    assert day04.Card.from_line("Card 1: 5 5 7 | 5 5 9").wins == 2
+
+
+@pytest.mark.parametrize("lines", [
+    # Same numbers in total, split differently around the |
+    [b"Card 1: 1 2 3 | 3 4", b"Card 2: 1 2 | 2 3 4"],
+    # Different counts of numbers
+    [b"Card 1: 1 2 | 2 3", b"Card 2: 10 20 | 20 10 30"],
+    # Same length and | position, but a different count of numbers before it
+    [b"Card 1:  1  2 | 1 2", b"Card 2: 12  3 | 3 1"],
+    [b"Card 1: 5 5 7 | 5 5 9", b"Card 2: 1 2 3 | 3 3 3"],
+])
+def test_chunk_wins_layouts(lines):
+    pytest.importorskip("numpy")
+    assert day04.chunk_wins(lines).tolist() == [
+        day04.Card.from_line(str(line, "ascii")).wins for line in lines
+    ]
+
+
+def test_scores_numpy_wide_cards():
+    np = pytest.importorskip("numpy")
+    wins = np.array([0, 1, 63, 64, 100])
+    assert day04.scores_numpy(wins) == sum(
+        day04.Card(1, list(range(1, count + 1)), list(range(1, count + 1))).score
+        for count in wins.tolist()
+    )
@@ -2,7 +2,7 @@ from unittest.mock import ANY
 
 import pytest
 
-from puzzles.day05.day05 import Almanac, Map, Mapping, Range
+from puzzles.day05.day05 import Almanac, Map, Mapping, Range, RangeSet
 
 
 @pytest.fixture
@@ -56,3 +56,67 @@ def test_conversion(almanac: Almanac):
     assert almanac.convert(Range(14, 15)) == [Range(43, 44)]
     assert almanac.convert(Range(55, 56)) == [Range(86, 87)]
     assert almanac.convert(Range(13, 14)) == [Range(35, 36)]
+
+
+def test_location_function(almanac: Almanac):
+    def stage_by_stage(seed: int) -> int:
+        ranges = [Range(seed, seed + 1)]
+        for mapp in almanac.maps:
+            ranges = [converted for r in ranges for converted in mapp.convert_src_to_dst(r)]
+        return ranges[0].lower
+
+    seeds = list(range(0, 110))
+    assert almanac.locations(seeds) == [stage_by_stage(seed) for seed in seeds]
+    assert almanac.lowest_locations(almanac.part2_seeds) == [46, 56]
+    assert almanac.lowest_location(Range(0, 110)) == min(map(stage_by_stage, seeds))
+
+
+def test_map_segments():
+    m = Map(
+        "",
+        [
+            Mapping(Range(0, 10), Range(200, 210)),
+            Mapping(Range(1000, 1050), Range(100, 150)),
+        ]
+    )
+    assert m.convert_src_to_dst(Range(90, 220)) == [
+        Range(90, 100), Range(1000, 1050), Range(150, 200), Range(0, 10), Range(210, 220),
+    ]
+    # The original order of the mappings is kept
+    assert m.mappings[0].source_range == Range(200, 210)
+
+
+def test_map_overlapping_sources():
+    # "100 0 10" and "200 5 10": the mapping listed first wins where they overlap
+    m = Map("", [Mapping(Range(100, 110), Range(0, 10)), Mapping(Range(200, 210), Range(5, 15))])
+    assert m.convert_src_to_dst(Range(0, 20)) == [Range(100, 110), Range(205, 210), Range(15, 20)]
+    m = Map("", [Mapping(Range(200, 210), Range(5, 15)), Mapping(Range(100, 110), Range(0, 10))])
+    assert m.convert_src_to_dst(Range(0, 20)) == [Range(100, 105), Range(200, 210), Range(15, 20)]
+
+
+def test_range_set():
+    ranges = RangeSet.from_ranges([
+        Range(10, 20), Range(0, 5), Range(5, 8), Range(15, 25), Range(30, 30),
+    ])
+    assert list(ranges) == [Range(0, 8), Range(10, 25)]
+    assert list(ranges.lowers) == [0, 10]
+    assert list(ranges.uppers) == [8, 25]
+
+
+def test_convert_ranges(almanac: Almanac):
+    assert list(almanac.convert_ranges(almanac.part2_seeds)) == [
+        Range(46, 61), Range(82, 85), Range(86, 90), Range(94, 99),
+    ]
+    assert almanac.convert_ranges(almanac.part1_seeds).lowers[0] == 35
+
+
+def test_inverse(almanac: Almanac):
+    assert almanac.lowest_reachable_location(almanac.part1_seeds) == 35
+    assert almanac.lowest_reachable_location(almanac.part2_seeds) == 46
+    assert list(almanac.seeds_for_locations(Range(46, 47), almanac.part2_seeds)) == [Range(82, 83)]
+    # Every seed mapping into the window, not just those in the seed ranges
+    for seed in almanac.seeds_for_locations(Range(0, 60)):
+        assert all(0 <= r.lower and r.upper <= 60 for r in almanac.convert(seed))
+    # seed-to-soil sends 98 and 99 to 50 and 51, and 0 to 49 are unmapped
+    preimage = almanac.maps[0].inverse().preimage(Range(48, 52))
+    assert list(preimage) == [Range(48, 50), Range(98, 100)]
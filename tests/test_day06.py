@@ -0,0 +1,42 @@
+import pytest
+
+from puzzles.day06 import day06
+
+
+def brute_force(race_time, record):
+    return sum(1 for hold in range(race_time + 1) if hold * (race_time - hold) > record)
+
+
+RACES = [(race_time, record) for race_time in range(0, 40) for record in range(0, 420, 7)]
+
+
+def test_ways_to_win():
+    for race_time, record in RACES:
+        assert day06.ways_to_win(race_time, record) == brute_force(race_time, record)
+    assert day06.ways_to_win(71530, 940200) == 71503
+
+
+def test_ways_to_win_beyond_floats():
+    # Precision past 2**53 matters here: the record is one short of the best possible distance
+    race_time = 2**70 + 2
+    assert day06.ways_to_win(race_time, (race_time // 2) ** 2 - 1) == 1
+    assert day06.ways_to_win(race_time, (race_time // 2) ** 2) == 0
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_ways_to_win_many(monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(day06, "np", None)
+    race_times, records = zip(*RACES)
+    assert day06.ways_to_win_many(race_times, records) == [
+        brute_force(race_time, record) for race_time, record in RACES
+    ]
+
+
+def test_puzzle_trailing_blank_line(tmp_path):
+    filename = tmp_path / "input.txt"
+    with open("puzzles/day06/test_input.txt", encoding="ascii") as f:
+        filename.write_text(f.read().rstrip("\n") + "\n\n")
+    assert day06.puzzle(str(filename)) == (288, 71503)
@@ -1,5 +1,7 @@
 from collections import Counter
 
+import pytest
+
 from puzzles.day07 import day07
 from puzzles.day07.day07 import hand_type, Hand, SORTABLE_CARD_TRANSLATION
 
@@ -55,3 +57,31 @@ def test_high_card():
 
 def test_ordering():
     assert day07.FIVE_OF_A_KIND > day07.FOUR_OF_A_KIND > day07.FULL_HOUSE > day07.TWO_PAIR > day07.ONE_PAIR > day07.HIGH_CARD
+
+
+def test_hand_types_table():
+    def types(cards):
+        return day07.HAND_TYPES[bytes(sorted(cards))]
+
+    assert len(day07.HAND_TYPES) == 6188
+    assert types(b"33KT2") == (int(day07.ONE_PAIR) - 1,) * 2
+    assert types(b"55JT5") == (int(day07.THREE_OF_A_KIND) - 1, int(day07.FOUR_OF_A_KIND) - 1)
+    assert types(b"JJJJJ") == (int(day07.FIVE_OF_A_KIND) - 1,) * 2
+
+
+def test_hand_keys():
+    # Type decides first, then the cards from the left
+    assert day07.hand_keys(b"22223")[0] > day07.hand_keys(b"AAKKQ")[0]
+    assert day07.hand_keys(b"KKKK2")[0] > day07.hand_keys(b"2AAAA")[0]
+    assert Hand("KKKK2 1").key_part1 == day07.hand_keys(b"KKKK2")[0]
+    # Jokers are the weakest card in part 2
+    assert day07.hand_keys(b"JKKK2")[1] < day07.hand_keys(b"QQQQ2")[1]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_total_winnings(monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(day07, "np", None)
+    assert day07.puzzle("puzzles/day07/test_input.txt") == (6440, 5905)
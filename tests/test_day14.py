@@ -28,6 +28,14 @@ def test_loading(example_input):
     assert str(Grid.from_text(example_input)) == example_input
 
 
+def test_loading_trailing_newline(example_input):
+    grid = Grid.from_text(example_input + "\n")
+    assert grid.height == 10
+    assert str(grid) == example_input
+    grid.tilt(grid.step_north)
+    assert grid.north_load() == 136
+
+
 def test_shift_noth(grid):
     grid.step_north()
     assert str(grid) == """\
@@ -0,0 +1,60 @@
+import importlib
+import io
+import random
+
+import pytest
+
+from benchmarks.generators import GENERATORS, _loop_cells, generate
+
+
+def generated_file(tmp_path, day, size, seed=0):
+    filename = tmp_path / f"day{day:02d}.txt"
+    with open(filename, "w", encoding="utf-8") as f:
+        generate(day, size, f, seed)
+    return str(filename)
+
+
+@pytest.mark.parametrize("day", sorted(GENERATORS))
+def test_deterministic(day):
+    first, second, other_seed = io.StringIO(), io.StringIO(), io.StringIO()
+    generate(day, 10, first, seed=1)
+    generate(day, 10, second, seed=1)
+    generate(day, 10, other_seed, seed=2)
+    assert first.getvalue() == second.getvalue()
+    assert first.getvalue() != other_seed.getvalue()
+    assert not first.getvalue().endswith("\n")
+
+
+@pytest.mark.parametrize("day", sorted(GENERATORS))
+def test_solvable(tmp_path, day):
+    puzzle = importlib.import_module(f"puzzles.day{day:02d}.day{day:02d}").puzzle
+    part1, part2 = puzzle(generated_file(tmp_path, day, 20))
+    assert isinstance(part1, int)
+    assert isinstance(part2, int)
+
+
+def test_day10_loop_area(tmp_path):
+    from puzzles.day10 import day10
+
+    # Pick's theorem gives the number of tiles inside the loop from its area and length
+    cells = _loop_cells(random.Random(5), 40)
+    area = abs(sum(
+        x0 * y1 - x1 * y0
+        for (x0, y0), (x1, y1) in zip(cells, cells[1:] + cells[:1])
+    )) // 2
+    inside = area - len(cells) // 2 + 1
+
+    filename = tmp_path / "day10.txt"
+    with open(filename, "w", encoding="utf-8") as f:
+        GENERATORS[10](random.Random(5), 40, f)
+    assert day10.puzzle(str(filename)) == (len(cells) // 2, inside)
+
+
+def test_day20_counter_periods(tmp_path):
+    from puzzles.day20 import day20
+
+    _, part2 = day20.puzzle(generated_file(tmp_path, 20, 3))
+    # Each counter resets at a distinct 12 bit prime, so the answer is their product
+    factors = [p for p in range(2049, 4096) if part2 % p == 0]
+    assert len(factors) == 3
+    assert factors[0] * factors[1] * factors[2] == part2
@@ -0,0 +1,39 @@
+import pytest
+
+from puzzles.common import instrument
+
+
+@pytest.fixture(autouse=True)
+def clean_instrument():
+    instrument.reset()
+    yield
+    instrument.disable()
+    instrument.reset()
+
+
+def test_disabled_collects_nothing():
+    with instrument.timer("phase"):
+        instrument.count("items", 3)
+    assert instrument.report() == {"timers": {}, "counters": {}}
+
+
+def test_timers_and_counters():
+    instrument.enable()
+    for _ in range(2):
+        with instrument.timer("phase"):
+            instrument.count("items", 3)
+    instrument.count("items")
+
+    collected = instrument.report()
+    assert collected["timers"]["phase"]["calls"] == 2
+    assert collected["timers"]["phase"]["seconds"] >= 0.0
+    assert collected["counters"] == {"items": 7}
+
+
+def test_merge():
+    first = {"timers": {"phase": {"seconds": 1.0, "calls": 1}}, "counters": {"items": 2}}
+    second = {"timers": {"phase": {"seconds": 0.5, "calls": 2}}, "counters": {"other": 1}}
+    assert instrument.merge([first, second]) == {
+        "timers": {"phase": {"seconds": 1.5, "calls": 3}},
+        "counters": {"items": 2, "other": 1},
+    }
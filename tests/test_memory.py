@@ -0,0 +1,32 @@
+from puzzles.common import memory
+
+
+def allocate():
+    # Big enough to dominate the peak, freed before traced() finishes
+    return len(bytearray(8 * memory.MIB))
+
+
+def test_traced_peak():
+    with memory.traced() as report:
+        allocate()
+    # tracemalloc's peak is exact even if the sampler never saw the allocation
+    assert report["peak"] >= 8 * memory.MIB
+
+
+def test_traced_live_allocation():
+    with memory.traced() as report:
+        kept = [0] * memory.MIB
+    assert len(kept) == memory.MIB
+    assert report["top"][0]["site"].startswith("tests/test_memory.py:")
+    assert report["top"][0]["bytes"] >= 8 * memory.MIB
+
+
+def test_format_table():
+    table = memory.format_table([{
+        "label": "day 08 input.txt",
+        "peak": 3 * memory.MIB,
+        "top": [{"site": "day08/day08.py:90", "bytes": memory.MIB}],
+    }])
+    assert "day 08 input.txt" in table
+    assert "3.00" in table
+    assert "day08/day08.py:90" in table
@@ -0,0 +1,39 @@
+import io
+
+from puzzles.common import puzzle_input
+
+
+def test_iter_lines():
+    lines = puzzle_input.iter_lines(b"ab\r\ncd\n\nef\n")
+    assert [bytes(line) for line in lines] == [b"ab", b"cd", b"", b"ef"]
+
+
+def test_iter_blocks():
+    blocks = puzzle_input.iter_blocks(b"seeds: 1 2\n\na map:\n1 2 3\n\nb map:\n4 5 6")
+    assert [bytes(block) for block in blocks] == [b"seeds: 1 2", b"a map:\n1 2 3", b"b map:\n4 5 6"]
+
+
+def test_lines_from_file(tmp_path):
+    filename = tmp_path / "input.txt"
+    filename.write_bytes(b"Time: 7 15\nDistance: 9 40")
+    assert [str(line, "ascii") for line in puzzle_input.lines(str(filename))] == [
+        "Time: 7 15",
+        "Distance: 9 40",
+    ]
+
+
+def test_empty_file(tmp_path):
+    filename = tmp_path / "empty.txt"
+    filename.write_bytes(b"")
+    assert not list(puzzle_input.lines(str(filename)))
+
+
+def test_lines_from_stream():
+    assert list(puzzle_input.lines(io.BytesIO(b"ab\r\ncd\n"))) == [b"ab", b"cd"]
+    assert list(puzzle_input.lines(io.StringIO("ab\ncd"))) == [b"ab", b"cd"]
+
+
+def test_is_path():
+    assert puzzle_input.is_path("input.txt")
+    assert not puzzle_input.is_path(puzzle_input.STDIN)
+    assert not puzzle_input.is_path(io.BytesIO())